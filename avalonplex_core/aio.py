@@ -0,0 +1,56 @@
+from asyncio import AbstractEventLoop, Semaphore, gather, get_event_loop
+from concurrent.futures import Executor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from avalonplex_core.model import Model, Episode, Show, Movie
+from avalonplex_core.serialize import XmlSerializer, WriteResult
+
+
+class AsyncXmlSerializer(XmlSerializer):
+    def __init__(self, executor: Optional[Executor] = None, max_concurrency: int = 8, **kwargs):
+        super().__init__(**kwargs)
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be positive: {max_concurrency}")
+        self.executor = executor  # type: Optional[Executor]
+        self.max_concurrency = max_concurrency  # type: int
+        self._semaphores = WeakKeyDictionary()  # type: WeakKeyDictionary
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        state["executor"] = None
+        state["_semaphores"] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._semaphores = WeakKeyDictionary()
+
+    async def aserialize(self, model: Model, name: str, folder: Optional[Path] = None) -> WriteResult:
+        return await self._run(partial(self.serialize, model, name, folder))
+
+    async def adeserialize(self, path: str) -> Union[Episode, Show, Movie]:
+        return await self._run(partial(self.deserialize, path))
+
+    async def aserialize_many(self, items: Iterable[Tuple[Model, str]], folder: Optional[Path] = None,
+                              return_exceptions: bool = False) -> List[Union[WriteResult, Exception]]:
+        return await gather(*[self.aserialize(model, name, folder) for model, name in items],
+                            return_exceptions=return_exceptions)
+
+    async def adeserialize_many(self, paths: Iterable[str],
+                                return_exceptions: bool = False) -> List[Union[Episode, Show, Movie, Exception]]:
+        return await gather(*[self.adeserialize(path) for path in paths], return_exceptions=return_exceptions)
+
+    async def _run(self, func: Callable[[], Any]) -> Any:
+        loop = get_event_loop()  # type: AbstractEventLoop
+        semaphore = self._semaphores.get(loop)  # type: Optional[Semaphore]
+        if semaphore is None:
+            semaphore = Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        async with semaphore:
+            return await loop.run_in_executor(self.executor, func)
+
+
+__all__ = [AsyncXmlSerializer]
@@ -0,0 +1,96 @@
+import posixpath
+import tarfile
+from fnmatch import fnmatch
+from io import UnsupportedOperation
+from mmap import ACCESS_READ, mmap
+from os import fstat
+from struct import unpack_from
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple, TypeVar, Union
+from zipfile import ZIP_STORED, BadZipFile, ZipFile, ZipInfo, is_zipfile
+from zlib import crc32
+
+T = TypeVar("T")
+
+
+def read_archive(file: BinaryIO, pattern: str, deserialize_bytes: Callable[[Union[bytes, memoryview]], T],
+                 deserialize_file: Callable[[BinaryIO], T]) -> Iterator[Tuple[str, Union[T, Exception]]]:
+    buffer = _map_file(file)  # type: Optional[mmap]
+    try:
+        view = memoryview(buffer) if buffer is not None else None  # type: Optional[memoryview]
+        try:
+            if is_zipfile(file):
+                yield from _read_zip(file, view, pattern, deserialize_bytes)
+            else:
+                file.seek(0)
+                yield from _read_tar(file, view, pattern, deserialize_bytes, deserialize_file)
+        finally:
+            if view is not None:
+                view.release()
+    finally:
+        if buffer is not None:
+            buffer.close()
+
+
+def _read_zip(file: BinaryIO, view: Optional[memoryview], pattern: str,
+              deserialize_bytes: Callable[[Union[bytes, memoryview]], T]) -> Iterator[Tuple[str, Union[T, Exception]]]:
+    with ZipFile(file) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not fnmatch(posixpath.basename(info.filename), pattern):
+                continue
+            try:
+                start = _stored_offset(view, info) if view is not None else None
+                if start is None:
+                    model = deserialize_bytes(archive.read(info))
+                else:
+                    with view[start:start + info.file_size] as data:
+                        if crc32(data) != info.CRC:
+                            raise BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+                        model = deserialize_bytes(data)
+            except Exception as e:
+                yield info.filename, e
+                continue
+            yield info.filename, model
+
+
+def _read_tar(file: BinaryIO, view: Optional[memoryview], pattern: str,
+              deserialize_bytes: Callable[[Union[bytes, memoryview]], T],
+              deserialize_file: Callable[[BinaryIO], T]) -> Iterator[Tuple[str, Union[T, Exception]]]:
+    with tarfile.open(fileobj=file, mode="r:*") as archive:
+        mapped = view is not None and archive.fileobj is file
+        for member in archive:
+            if not member.isfile() or not fnmatch(posixpath.basename(member.name), pattern):
+                continue
+            try:
+                if mapped and not member.issparse():
+                    with view[member.offset_data:member.offset_data + member.size] as data:
+                        model = deserialize_bytes(data)
+                else:
+                    model = deserialize_file(archive.extractfile(member))
+            except Exception as e:
+                yield member.name, e
+                continue
+            yield member.name, model
+
+
+def _map_file(file: BinaryIO) -> Optional[mmap]:
+    try:
+        fileno = file.fileno()
+        if fstat(fileno).st_size == 0:
+            return None
+        return mmap(fileno, 0, access=ACCESS_READ)
+    except (AttributeError, OSError, ValueError, UnsupportedOperation):
+        return None
+
+
+def _stored_offset(view: memoryview, info: ZipInfo) -> Optional[int]:
+    if info.compress_type != ZIP_STORED or info.flag_bits & 0x1:
+        return None
+    offset = info.header_offset
+    if view[offset:offset + 4] != b"PK\x03\x04":
+        return None
+    name_length, extra_length = unpack_from("<HH", view, offset + 26)
+    start = offset + 30 + name_length + extra_length
+    return start if start + info.file_size <= len(view) else None
+
+
+__all__ = [read_archive]
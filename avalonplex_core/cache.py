@@ -0,0 +1,139 @@
+import sqlite3
+from hashlib import blake2b, sha1
+from os import stat_result
+from pickle import HIGHEST_PROTOCOL, dumps, loads
+from threading import local
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from avalonplex_core.model import Model, Episode, Show, Movie, Actor
+from avalonplex_core.utils import chunked
+
+_format_version = 1
+
+
+def schema_version(models: Sequence[type] = (Episode, Show, Movie, Actor)) -> str:
+    parts = [f"format={_format_version}"]
+    for model in models:
+        fields = ",".join(f"{f.name}:{f.tag}:{f.codec.__name__}:{int(f.multiple)}" for f in model._schema.fields)
+        parts.append(f"{model.__name__}:{model._root}[{fields}]")
+    return sha1(";".join(parts).encode("utf-8")).hexdigest()
+
+
+def digest(data: bytes) -> bytes:
+    return blake2b(data, digest_size=16).digest()
+
+
+class ParseCache:
+    def __init__(self, path: str, version: Optional[str] = None, timeout: float = 30.0):
+        self.path = path  # type: str
+        self.version = version if version is not None else schema_version()  # type: str
+        self.timeout = timeout  # type: float
+        self._local = local()
+        self._initialize()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)  # type: Optional[sqlite3.Connection]
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _initialize(self):
+        connection = self._connection()
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        connection.execute("CREATE TABLE IF NOT EXISTS entries (path TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+                           "mtime_ns INTEGER NOT NULL, digest BLOB NOT NULL, payload BLOB NOT NULL)")
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != self.version:
+                connection.execute("DELETE FROM entries")
+                connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (self.version,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)  # type: Optional[sqlite3.Connection]
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def __enter__(self) -> "ParseCache":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def index(self, prefix: str = "") -> Dict[str, Tuple[int, int]]:
+        if len(prefix) == 0:
+            rows = self._connection().execute("SELECT path, size, mtime_ns FROM entries")
+        else:
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            rows = self._connection().execute("SELECT path, size, mtime_ns FROM entries WHERE path >= ? AND path < ?",
+                                              (prefix, upper))
+        return {path: (size, mtime_ns) for path, size, mtime_ns in rows}
+
+    def get(self, path: str, current: stat_result) -> Optional[Union[Episode, Show, Movie]]:
+        row = self._connection().execute("SELECT size, mtime_ns, payload FROM entries WHERE path = ?",
+                                         (path,)).fetchone()
+        if row is None or row[0] != current.st_size or row[1] != current.st_mtime_ns:
+            return None
+        return loads(row[2])
+
+    def get_by_digest(self, path: str, current: stat_result,
+                      data_digest: bytes) -> Optional[Union[Episode, Show, Movie]]:
+        connection = self._connection()
+        row = connection.execute("SELECT digest, payload FROM entries WHERE path = ?", (path,)).fetchone()
+        if row is None or row[0] != data_digest:
+            return None
+        connection.execute("UPDATE entries SET size = ?, mtime_ns = ? WHERE path = ?",
+                           (current.st_size, current.st_mtime_ns, path))
+        return loads(row[1])
+
+    def get_many(self, paths: Iterable[str], batch_size: int = 500) -> Iterator[Tuple[str, Model]]:
+        connection = self._connection()
+        for batch in chunked(paths, batch_size):
+            placeholders = ",".join("?" * len(batch))
+            rows = connection.execute(f"SELECT path, payload FROM entries WHERE path IN ({placeholders})", batch)
+            payloads = {path: payload for path, payload in rows}
+            for path in batch:
+                if path in payloads:
+                    yield path, loads(payloads[path])
+
+    def put(self, path: str, current: stat_result, data_digest: bytes, model: Model):
+        self.put_many([(path, current, data_digest, model)])
+
+    def put_many(self, entries: Iterable[Tuple[str, stat_result, bytes, Model]]):
+        rows = [(path, current.st_size, current.st_mtime_ns, data_digest, dumps(model, HIGHEST_PROTOCOL))
+                for path, current, data_digest, model in entries]  # type: List[Tuple[str, int, int, bytes, bytes]]
+        if len(rows) == 0:
+            return
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany("INSERT OR REPLACE INTO entries (path, size, mtime_ns, digest, payload) "
+                                   "VALUES (?, ?, ?, ?, ?)", rows)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def discard(self, paths: Iterable[str]):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany("DELETE FROM entries WHERE path = ?", [(path,) for path in paths])
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+
+__all__ = [ParseCache, schema_version, digest]
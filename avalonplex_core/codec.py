@@ -0,0 +1,49 @@
+import json
+from typing import Any, Dict, Iterable, List, Type, Union
+
+from avalonplex_core.model import Model, Episode, Show, Movie, Actor
+
+_models = {
+    model._root: model for model in (Episode, Show, Movie, Actor)
+}  # type: Dict[str, Type[Model]]
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_decoder = json.JSONDecoder()
+
+
+def dumps(model: Model, ignore_none: bool = True, ignore_empty: bool = True, ignore_blank: bool = True,
+          trim: bool = True) -> str:
+    return _encoder.encode({model._root: model.as_dict(ignore_none, ignore_empty, ignore_blank, trim)})
+
+
+def loads(data: Union[str, bytes]) -> Union[Episode, Show, Movie, Actor]:
+    return _from_wrapped(_decoder.decode(_as_text(data)))
+
+
+def dumps_many(models: Iterable[Model], ignore_none: bool = True, ignore_empty: bool = True,
+               ignore_blank: bool = True, trim: bool = True) -> str:
+    return _encoder.encode([{model._root: model.as_dict(ignore_none, ignore_empty, ignore_blank, trim)}
+                            for model in models])
+
+
+def loads_many(data: Union[str, bytes]) -> List[Union[Episode, Show, Movie, Actor]]:
+    items = _decoder.decode(_as_text(data))
+    if not isinstance(items, list):
+        raise ValueError(f"Expected a JSON array, got {type(items).__name__}")
+    return [_from_wrapped(item) for item in items]
+
+
+def _as_text(data: Union[str, bytes]) -> str:
+    return data.decode("utf-8") if isinstance(data, (bytes, bytearray)) else data
+
+
+def _from_wrapped(item: Any) -> Union[Episode, Show, Movie, Actor]:
+    if not isinstance(item, dict) or len(item) != 1:
+        raise ValueError(f"Expected an object with a single root key: {item!r}")
+    (root, data), = item.items()
+    model_class = _models.get(root)
+    if model_class is None:
+        raise NotImplementedError(f"Not supported root tag: {root}")
+    return model_class.from_dict(data)
+
+
+__all__ = [dumps, loads, dumps_many, loads_many]
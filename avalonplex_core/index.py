@@ -0,0 +1,146 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import date
+from typing import Any, DefaultDict, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from avalonplex_core.model import Model
+
+_list_facets = {"genre": "genres", "set": "sets", "director": "directors", "writer": "writers"}  # type: Dict[str, str]
+_facets = ("type", "genre", "actor", "set", "studio", "director", "writer", "year")
+
+
+class LibraryIndex:
+    def __init__(self, models: Iterable[Model] = ()):
+        self._models = {}  # type: Dict[int, Model]
+        self._keys = {}  # type: Dict[int, List[Tuple[str, Any]]]
+        self._dates = {}  # type: Dict[int, date]
+        self._postings = {
+            facet: defaultdict(set) for facet in _facets
+        }  # type: Dict[str, DefaultDict[Any, Set[int]]]
+        self._by_date = defaultdict(set)  # type: DefaultDict[date, Set[int]]
+        self._sorted_dates = []  # type: List[date]
+        for model in models:
+            self.add(model)
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def __contains__(self, model: Model) -> bool:
+        return id(model) in self._models
+
+    def __iter__(self) -> Iterator[Model]:
+        return iter(self._models.values())
+
+    def add(self, model: Model):
+        key = id(model)
+        if key in self._models:
+            raise ValueError(f"Model already indexed: {model!r}")
+        self._models[key] = model
+        model_date = _get_date(model)
+        keys = _extract(model, model_date)
+        self._keys[key] = keys
+        postings = self._postings
+        for facet, value in keys:
+            postings[facet][value].add(key)
+        if model_date is not None:
+            self._dates[key] = model_date
+            ids = self._by_date[model_date]
+            if len(ids) == 0:
+                insort(self._sorted_dates, model_date)
+            ids.add(key)
+
+    def remove(self, model: Model):
+        key = id(model)
+        if key not in self._models:
+            raise KeyError(f"Model not indexed: {model!r}")
+        del self._models[key]
+        for facet, value in self._keys.pop(key):
+            postings = self._postings[facet]
+            ids = postings[value]
+            ids.discard(key)
+            if len(ids) == 0:
+                del postings[value]
+        model_date = self._dates.pop(key, None)
+        if model_date is not None:
+            ids = self._by_date[model_date]
+            ids.discard(key)
+            if len(ids) == 0:
+                del self._by_date[model_date]
+                del self._sorted_dates[bisect_left(self._sorted_dates, model_date)]
+
+    def update(self, model: Model):
+        self.remove(model)
+        self.add(model)
+
+    def keys(self, facet: str) -> Dict[Any, int]:
+        return {value: len(ids) for value, ids in self._postings[facet].items()}
+
+    def query(self, type: Optional[type] = None, genre: Any = None, actor: Any = None, set: Any = None,
+              studio: Any = None, director: Any = None, writer: Any = None, year: Any = None,
+              since: Optional[date] = None, until: Optional[date] = None) -> List[Model]:
+        criteria = {"type": type, "genre": genre, "actor": actor, "set": set, "studio": studio,
+                    "director": director, "writer": writer, "year": year}
+        candidates = []  # type: List[Set[int]]
+        for facet, values in criteria.items():
+            if values is None:
+                continue
+            postings = self._postings[facet]
+            for value in _as_values(values):
+                ids = postings.get(value)
+                if ids is None:
+                    return []
+                candidates.append(ids)
+        if len(candidates) == 0:
+            if since is None and until is None:
+                return list(self._models.values())
+            return [self._models[key] for key in self._date_range(since, until)]
+        candidates.sort(key=len)
+        result = candidates[0].intersection(*candidates[1:])
+        if since is not None or until is not None:
+            result = {key for key in result if _in_range(self._dates.get(key), since, until)}
+        return [self._models[key] for key in result]
+
+    def _date_range(self, since: Optional[date], until: Optional[date]) -> Iterator[int]:
+        start = bisect_left(self._sorted_dates, since) if since is not None else 0
+        end = bisect_right(self._sorted_dates, until) if until is not None else len(self._sorted_dates)
+        for model_date in self._sorted_dates[start:end]:
+            yield from self._by_date[model_date]
+
+
+def _as_values(values: Any) -> Iterable[Any]:
+    if isinstance(values, (list, tuple, frozenset, set)):
+        return values
+    return (values,)
+
+
+def _in_range(model_date: Optional[date], since: Optional[date], until: Optional[date]) -> bool:
+    if model_date is None:
+        return False
+    return (since is None or model_date >= since) and (until is None or model_date <= until)
+
+
+def _get_date(model: Model) -> Optional[date]:
+    for field in model._schema.fields:
+        if field.codec is date:
+            value = getattr(model, field.name)
+            if isinstance(value, date):
+                return value
+    return None
+
+
+def _extract(model: Model, model_date: Optional[date]) -> List[Tuple[str, Any]]:
+    keys = {("type", type(model))}
+    by_name = model._schema.by_name
+    for facet, name in _list_facets.items():
+        if name in by_name:
+            keys.update((facet, value) for value in getattr(model, name) or () if value is not None)
+    if "studio" in by_name and model.studio is not None:
+        keys.add(("studio", model.studio))
+    if "actors" in by_name:
+        keys.update(("actor", actor.name) for actor in model.actors or () if actor.name is not None)
+    if model_date is not None:
+        keys.add(("year", model_date.year))
+    return list(keys)
+
+
+__all__ = [LibraryIndex]
@@ -0,0 +1,89 @@
+from sys import getsizeof
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from avalonplex_core.model import Model, Actor
+
+_default_fields = frozenset({
+    "name", "role", "thumb", "mpaa", "studio", "sets", "genres", "directors", "writers", "actors"
+})  # type: FrozenSet[str]
+
+
+class InternPool:
+    def __init__(self, fields: Iterable[str] = _default_fields, actors: bool = False):
+        self.fields = frozenset(fields)  # type: FrozenSet[str]
+        self.actors = actors  # type: bool
+        self.lookups = 0  # type: int
+        self.hits = 0  # type: int
+        self.saved_bytes = 0  # type: int
+        self._values = {}  # type: Dict[str, str]
+        self._actors = {}  # type: Dict[Tuple[Any, ...], Actor]
+        self._plans = {}  # type: Dict[type, Tuple[Tuple[str, bool, bool], ...]]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def unique_ratio(self) -> float:
+        return len(self._values) / self.lookups if self.lookups > 0 else 1.0
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        if type(value) is not str:
+            return value
+        self.lookups += 1
+        existing = self._values.setdefault(value, value)
+        if existing is not value:
+            self.hits += 1
+            self.saved_bytes += getsizeof(value)
+        return existing
+
+    def intern_model(self, model: Model) -> Model:
+        for name, multiple, nested in self._plan(type(model)):
+            value = getattr(model, name)
+            if value is None:
+                continue
+            if not multiple:
+                setattr(model, name, self._intern_nested(value) if nested else self.intern(value))
+            elif nested:
+                setattr(model, name, [self._intern_nested(sub_value) for sub_value in value])
+            else:
+                setattr(model, name, [self.intern(sub_value) for sub_value in value])
+        return model
+
+    def clear(self):
+        self.lookups = self.hits = self.saved_bytes = 0
+        self._values.clear()
+        self._actors.clear()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "lookups": self.lookups,
+            "unique": len(self._values),
+            "hits": self.hits,
+            "unique_ratio": self.unique_ratio,
+            "saved_bytes": self.saved_bytes,
+            "actors": len(self._actors)
+        }
+
+    def _intern_nested(self, model: Any) -> Any:
+        if not isinstance(model, Model):
+            return model
+        self.intern_model(model)
+        if not self.actors or type(model) is not Actor:
+            return model
+        existing = self._actors.setdefault(model._get_values(), model)
+        if existing is not model:
+            self.saved_bytes += getsizeof(model)
+        return existing
+
+    def _plan(self, cls: type) -> Tuple[Tuple[str, bool, bool], ...]:
+        plan = self._plans.get(cls)
+        if plan is None:
+            fields = [(field.name, field.multiple, issubclass(field.codec, Model))
+                      for field in cls._schema.fields
+                      if field.name in self.fields and (field.codec is str or issubclass(field.codec, Model))
+                      ]  # type: List[Tuple[str, bool, bool]]
+            plan = self._plans[cls] = tuple(fields)
+        return plan
+
+
+__all__ = [InternPool]
@@ -1,64 +1,215 @@
-from datetime import date, datetime
-from typing import Optional, List, Dict, Any, Tuple
+from datetime import date
+from inspect import Parameter, signature
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 from xml.etree.ElementTree import Element, SubElement
 
+from avalonplex_core.schema import Field, Schema, format_date, parse_date
+from avalonplex_core.utils import escape_text
 
-class Model:
-    def __init__(self, root: str):
-        self._root = root  # type: str
+_indent = "    "
+
+
+class _ModelMeta(type):
+    def __new__(mcs, name: str, bases: tuple, namespace: dict, **kwargs):
+        if "__slots__" not in namespace:
+            slotted = {slot for base in bases for cls in base.__mro__ for slot in getattr(cls, "__slots__", ())}
+            namespace["__slots__"] = tuple(field.name for field in namespace.get("_fields", ())
+                                           if field.name not in slotted)
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
+class Model(metaclass=_ModelMeta):
+    __slots__ = ("_raw",)
+    _root = None  # type: Optional[str]
+    _fields = ()  # type: Sequence[Field]
+    _schema = Schema(())  # type: Schema
+    _positional = False  # type: bool
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._schema = Schema(cls._fields)
+        cls._positional = _takes_values(cls)
 
     def __repr__(self):
         values = ", ".join([f"{attr}={value}" for attr, value in self._get_attributes().items()])
         return f"{self.__class__}({values})"
 
     def __eq__(self, other):
-        return self.__dict__ == other.__dict__
+        if not isinstance(other, Model):
+            return NotImplemented
+        return type(self) is type(other) and self._get_values() == other._get_values()
+
+    def __hash__(self):
+        return hash((type(self), tuple(tuple(value) if isinstance(value, list) else value
+                                       for value in self._get_values())))
+
+    def __reduce__(self):
+        if self._positional:
+            return type(self), self._get_values()
+        return _restore, (type(self), self._get_values())
+
+    def __getattr__(self, name: str) -> Any:
+        field = self._schema.by_name.get(name) if name != "_raw" else None
+        root = None if field is None else getattr(self, "_raw", None)  # type: Optional[Element]
+        if root is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        value = self._decode_field(field, [element for element in root if element.tag == field.tag])
+        setattr(self, name, value)
+        return value
+
+    def _get_values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._schema.names)
 
     def _get_attributes(self) -> Dict[str, Any]:
-        mapping = self._mapping()
-        attributes_map = {}
-        attributes = [name for name in dir(self) if not name.startswith("_")]
-        for attribute in attributes:
-            value = getattr(self, attribute)
-            if not callable(value):
-                name = attribute
-                if name in mapping:
-                    name = mapping[name]
-                attributes_map[name] = value
-        return attributes_map
+        return {field.tag: getattr(self, field.name) for field in self._schema.fields}
 
-    @staticmethod
-    def _mapping() -> Dict[str, str]:
-        return {}
+    @classmethod
+    def _mapping(cls) -> Dict[str, str]:
+        return dict(cls._schema.mapping)
 
     def _get_attribute_order(self, attr: Tuple[str, Any]) -> int:
-        order_list = self._get_attribute_order_list()
-        if order_list is None:
-            return -1
-        try:
-            return order_list.index(attr[0])
-        except ValueError:
-            return -1
+        field = self._schema.by_tag.get(attr[0])
+        return field.order if field is not None else -1
+
+    @classmethod
+    def _get_attribute_order_list(cls) -> Optional[List[str]]:
+        return list(cls._schema.tags) if len(cls._schema.tags) > 0 else None
+
+    @classmethod
+    def from_xml(cls, root: Element, lazy: bool = False) -> "Model":
+        if lazy:
+            model = cls.__new__(cls)
+            model._raw = root
+            return model
+        model = cls()
+        by_tag = cls._schema.by_tag
+        seen = set()
+        lists = {}  # type: Dict[str, List[Any]]
+        for element in root:
+            field = by_tag.get(element.tag)
+            if field is None:
+                continue
+            name = field.name
+            if field.multiple:
+                if name in lists:
+                    lists[name].append(field.decode(element))
+                else:
+                    lists[name] = [field.decode(element)]
+            elif name not in seen:
+                seen.add(name)
+                try:
+                    setattr(model, name, field.decode(element))
+                except TypeError:
+                    pass
+        for name, values in lists.items():
+            setattr(model, name, values)
+        return model
+
+    @classmethod
+    def from_elements(cls, elements: Dict[str, List[Element]]) -> "Model":
+        model = cls()
+        for name, field_elements in elements.items():
+            setattr(model, name, cls._decode_field(cls._schema.by_name[name], field_elements))
+        return model
 
     @staticmethod
-    def _get_attribute_order_list() -> Optional[List[str]]:
-        return None
+    def _decode_field(field: Field, elements: List[Element]) -> Any:
+        if field.multiple:
+            return [field.decode(element) for element in elements]
+        if len(elements) == 0:
+            return None
+        try:
+            return field.decode(elements[0])
+        except TypeError:
+            return None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Model":
+        model = cls.__new__(cls)
+        for field in cls._schema.fields:
+            value = data.get(field.name)
+            if field.multiple:
+                value = [_decode_value(field.codec, sub_value) for sub_value in value] if value is not None else []
+            elif value is not None:
+                value = _decode_value(field.codec, value)
+            setattr(model, field.name, value)
+        return model
+
+    def as_dict(self, ignore_none: bool = True, ignore_empty: bool = True, ignore_blank: bool = True,
+                trim: bool = True) -> Dict[str, Any]:
+        result = {}  # type: Dict[str, Any]
+        for field in self._schema.fields:
+            value = _encode_value(getattr(self, field.name), ignore_none, ignore_empty, ignore_blank, trim)
+            if value is not _skip:
+                result[field.name] = value
+        return result
 
     def as_element(self, ignore_none: bool = True, ignore_empty: bool = True, ignore_blank: bool = True,
                    trim: bool = True) -> Element:
         element = Element(self._root)
-        attributes = [(tag, value) for tag, value in self._get_attributes().items()]
-        attributes.sort(key=self._get_attribute_order)
-        for tag, value in attributes:
-            self._insert_sub_element(element, tag, value, ignore_none, ignore_empty, ignore_blank, trim)
+        for field in self._schema.fields:
+            self._insert_sub_element(element, field.tag, getattr(self, field.name), ignore_none, ignore_empty,
+                                     ignore_blank, trim)
         return element
 
+    def as_xml(self, ignore_none: bool = True, ignore_empty: bool = True, ignore_blank: bool = True,
+               trim: bool = True, short_empty_elements: bool = False) -> str:
+        parts = []  # type: List[str]
+        self._write_xml(parts, "", ignore_none, ignore_empty, ignore_blank, trim, short_empty_elements)
+        return "".join(parts)
+
+    def _write_xml(self, parts: List[str], indent: str, ignore_none: bool, ignore_empty: bool, ignore_blank: bool,
+                   trim: bool, short_empty_elements: bool):
+        start = len(parts)
+        parts.append(f"{indent}<{self._root}>\n")
+        child_indent = indent + _indent
+        for field in self._schema.fields:
+            self._write_sub_element(parts, child_indent, field.tag, getattr(self, field.name), ignore_none,
+                                    ignore_empty, ignore_blank, trim, short_empty_elements)
+        if len(parts) > start + 1:
+            parts.append(f"{indent}</{self._root}>\n")
+        elif short_empty_elements:
+            parts[start] = f"{indent}<{self._root} />\n"
+        else:
+            parts[start] = f"{indent}<{self._root}></{self._root}>\n"
+
+    def _write_sub_element(self, parts: List[str], indent: str, tag: str, value: Any, ignore_none: bool,
+                           ignore_empty: bool, ignore_blank: bool, trim: bool, short_empty_elements: bool):
+        if type(value) is str:
+            str_value = value
+        elif value is None:
+            if ignore_none:
+                return
+            str_value = ""
+        elif isinstance(value, date):
+            str_value = format_date(value)
+        elif isinstance(value, list):
+            for sub_value in value:
+                self._write_sub_element(parts, indent, tag, sub_value, ignore_none, ignore_empty, ignore_blank, trim,
+                                        short_empty_elements)
+            return
+        elif isinstance(value, Model):
+            value._write_xml(parts, indent, ignore_none, ignore_empty, ignore_blank, trim, short_empty_elements)
+            return
+        else:
+            str_value = str(value)
+        if trim:
+            str_value = str_value.strip()
+        if ignore_blank and str_value.isspace():
+            return
+        if ignore_empty and len(str_value) == 0:
+            return
+        if short_empty_elements and len(str_value) == 0:
+            parts.append(f"{indent}<{tag} />\n")
+        else:
+            parts.append(f"{indent}<{tag}>{escape_text(str_value)}</{tag}>\n")
+
     def _insert_sub_element(self, parent: Element, tag: str, value: Any, ignore_none: bool, ignore_empty: bool,
                             ignore_blank: bool, trim: bool):
         if ignore_none and value is None:
             return
         if isinstance(value, date):
-            str_value = value.strftime("%Y-%m-%d")
+            str_value = format_date(value)
         elif isinstance(value, list):
             for sub_value in value:
                 self._insert_sub_element(parent, tag, sub_value, ignore_none, ignore_empty, ignore_blank, trim)
@@ -77,11 +228,71 @@ class Model:
         SubElement(parent, tag).text = str_value
 
 
+_skip = object()
+
+
+def _encode_value(value: Any, ignore_none: bool, ignore_empty: bool, ignore_blank: bool, trim: bool) -> Any:
+    if type(value) is str:
+        if trim:
+            value = value.strip()
+        if ignore_blank and value.isspace():
+            return _skip
+        if ignore_empty and len(value) == 0:
+            return _skip
+        return value
+    if value is None:
+        return _skip if ignore_none else None
+    if isinstance(value, date):
+        return date.isoformat(value)
+    if isinstance(value, list):
+        values = []  # type: List[Any]
+        for sub_value in value:
+            sub_value = _encode_value(sub_value, ignore_none, ignore_empty, ignore_blank, trim)
+            if sub_value is not _skip:
+                values.append(sub_value)
+        if ignore_empty and len(values) == 0:
+            return _skip
+        return values
+    if isinstance(value, Model):
+        return value.as_dict(ignore_none, ignore_empty, ignore_blank, trim)
+    return value
+
+
+def _decode_value(codec: type, value: Any) -> Any:
+    if value is None or codec is str or isinstance(value, codec):
+        return value
+    if codec is date:
+        return parse_date(value)
+    if isinstance(value, dict):
+        return codec.from_dict(value)
+    return codec(value)
+
+
+def _takes_values(cls: type) -> bool:
+    try:
+        parameters = list(signature(cls.__init__).parameters.values())[1:]
+    except (TypeError, ValueError):
+        return False
+    return tuple(parameter.name for parameter in parameters) == cls._schema.names and \
+        all(parameter.kind is Parameter.POSITIONAL_OR_KEYWORD for parameter in parameters)
+
+
+def _restore(cls: type, values: Tuple[Any, ...]) -> Model:
+    model = cls.__new__(cls)
+    for name, value in zip(cls._schema.names, values):
+        setattr(model, name, value)
+    return model
+
+
 class Episode(Model):
+    _root = "episodedetails"
+    _fields = (Field("title"), Field("episode", codec=int), Field("aired", codec=date), Field("mpaa"),
+               Field("plot"), Field("directors", "director", multiple=True),
+               Field("writers", "writer", multiple=True), Field("rating", codec=float))
+
     def __init__(self, title: Optional[str] = None, episode: Optional[int] = None, aired: Optional[date] = None,
                  mpaa: Optional[str] = None, plot: Optional[str] = None, directors: Optional[List[str]] = None,
                  writers: Optional[List[str]] = None, rating: Optional[float] = None):
-        super().__init__("episodedetails")
         self.title = title  # type: Optional[str]
         self.episode = episode  # type: Optional[int]
         self.aired = aired  # type: Optional[date]
@@ -91,78 +302,29 @@ class Episode(Model):
         self.writers = writers if writers is not None else []  # type: List[str]
         self.rating = rating  # type: Optional[float]
 
-    @staticmethod
-    def _mapping() -> Dict[str, str]:
-        return {"directors": "director", "writers": "writer"}
-
-    @staticmethod
-    def _get_attribute_order_list() -> Optional[List[str]]:
-        return ["title", "episode", "aired", "mpaa", "plot", "director", "writer", "rating"]
-
-    @staticmethod
-    def from_xml(root: Element) -> "Episode":
-        episode = Episode()
-        mapping = Episode._mapping()
-        for attr in Episode._get_attribute_order_list():
-            attr_key = attr
-            for key, value in mapping.items():
-                if value == attr:
-                    attr_key = key
-                    break
-            elements = root.findall(attr)  # type: List[Element]
-            if len(elements) == 0:
-                continue
-            try:
-                if attr_key == "rating":
-                    setattr(episode, attr_key, float(elements[0].text))
-                elif attr_key == "episode":
-                    setattr(episode, attr_key, int(elements[0].text))
-                elif attr_key in ["directors", "writers"]:
-                    setattr(episode, attr_key, [e.text for e in elements])
-                elif attr_key == "aired":
-                    setattr(episode, attr_key, datetime.strptime(elements[0].text, "%Y-%m-%d").date())
-                else:
-                    setattr(episode, attr_key, elements[0].text)
-            except TypeError:
-                pass
-        return episode
-
 
 class Actor(Model):
+    _root = "actor"
+    _fields = (Field("name"), Field("role"), Field("thumb"))
+
     def __init__(self, name: Optional[str] = None, role: Optional[str] = None, thumb: Optional[str] = None):
-        super().__init__("actor")
         self.name = name  # type: Optional[str]
         self.role = role  # type: Optional[str]
         self.thumb = thumb  # type: Optional[str]
 
-    @staticmethod
-    def _get_attribute_order_list() -> Optional[List[str]]:
-        return ["name", "role", "thumb"]
-
-    @staticmethod
-    def from_xml(root: Element) -> "Actor":
-        actor = Actor()
-        mapping = Actor._mapping()
-        for attr in Actor._get_attribute_order_list():
-            attr_key = attr
-            for key, value in mapping.items():
-                if value == attr:
-                    attr_key = key
-                    break
-            elements = root.findall(attr)  # type: List[Element]
-            if len(elements) == 0:
-                continue
-            setattr(actor, attr_key, elements[0].text)
-        return actor
-
 
 class Show(Model):
+    _root = "tvshow"
+    _fields = (Field("title"), Field("original_title", "originaltitle"), Field("sort_title", "sorttitle"),
+               Field("sets", "set", multiple=True), Field("mpaa"), Field("plot"), Field("tag_line", "tagline"),
+               Field("rating", codec=float), Field("premiered", codec=date), Field("studio"),
+               Field("genres", "genre", multiple=True), Field("actors", "actor", codec=Actor, multiple=True))
+
     def __init__(self, title: Optional[str] = None, original_title: Optional[str] = None,
                  sort_title: Optional[str] = None, sets: Optional[List[str]] = None, mpaa: Optional[str] = None,
                  plot: Optional[str] = None, tag_line: Optional[str] = None, rating: Optional[float] = None,
                  premiered: Optional[date] = None, studio: Optional[str] = None, genres: Optional[List[str]] = None,
                  actors: Optional[List[Actor]] = None):
-        super().__init__("tvshow")
         self.title = title  # type: Optional[str]
         self.original_title = original_title  # type: Optional[str]
         self.sort_title = sort_title  # type: Optional[str]
@@ -176,53 +338,21 @@ class Show(Model):
         self.genres = genres if genres is not None else []  # type: List[str]
         self.actors = actors if actors is not None else []  # type: List[Actor]
 
-    @staticmethod
-    def _mapping() -> Dict[str, str]:
-        return {"original_title": "originaltitle", "sort_title": "sorttitle", "sets": "set", "tag_line": "tagline",
-                "genres": "genre", "actors": "actor"}
-
-    @staticmethod
-    def _get_attribute_order_list() -> Optional[List[str]]:
-        return ["title", "originaltitle", "sorttitle", "set", "mpaa", "plot", "tagline", "rating", "premiered",
-                "studio", "genre", "actor"]
-
-    @staticmethod
-    def from_xml(root: Element) -> "Show":
-        show = Show()
-        mapping = Show._mapping()
-        for attr in Show._get_attribute_order_list():
-            attr_key = attr
-            for key, value in mapping.items():
-                if value == attr:
-                    attr_key = key
-                    break
-            elements = root.findall(attr)  # type: List[Element]
-            if len(elements) == 0:
-                continue
-            try:
-                if attr_key == "rating":
-                    setattr(show, attr_key, float(elements[0].text))
-                elif attr_key in ["sets", "genres"]:
-                    setattr(show, attr_key, [e.text for e in elements])
-                elif attr_key == "actors":
-                    setattr(show, attr_key, [Actor.from_xml(e) for e in elements])
-                elif attr_key == "premiered":
-                    setattr(show, attr_key, datetime.strptime(elements[0].text, "%Y-%m-%d").date())
-                else:
-                    setattr(show, attr_key, elements[0].text)
-            except TypeError:
-                pass
-        return show
-
 
 class Movie(Model):
+    _root = "movie"
+    _fields = (Field("title"), Field("original_title", "originaltitle"), Field("sort_title", "sorttitle"),
+               Field("sets", "set", multiple=True), Field("mpaa"), Field("plot"), Field("tag_line", "tagline"),
+               Field("rating", codec=float), Field("release_date", "releasedate", codec=date), Field("studio"),
+               Field("directors", "director", multiple=True), Field("writers", "writer", multiple=True),
+               Field("genres", "genre", multiple=True), Field("actors", "actor", codec=Actor, multiple=True))
+
     def __init__(self, title: Optional[str] = None, original_title: Optional[str] = None,
                  sort_title: Optional[str] = None, sets: Optional[List[str]] = None, mpaa: Optional[str] = None,
                  plot: Optional[str] = None, tag_line: Optional[str] = None, rating: Optional[float] = None,
                  release_date: Optional[date] = None, studio: Optional[str] = None,
                  directors: Optional[List[str]] = None, writers: Optional[List[str]] = None,
                  genres: Optional[List[str]] = None, actors: Optional[List[Actor]] = None):
-        super().__init__("movie")
         self.title = title  # type: Optional[str]
         self.original_title = original_title  # type: Optional[str]
         self.sort_title = sort_title  # type: Optional[str]
@@ -238,44 +368,5 @@ class Movie(Model):
         self.genres = genres if genres is not None else []  # type: List[str]
         self.actors = actors if actors is not None else []  # type: List[Actor]
 
-    @staticmethod
-    def _mapping() -> Dict[str, str]:
-        return {"original_title": "originaltitle", "sort_title": "sorttitle", "sets": "set",
-                "release_date": "releasedate", "tag_line": "tagline", "directors": "director", "writers": "writer",
-                "genres": "genre", "actors": "actor"}
-
-    @staticmethod
-    def _get_attribute_order_list() -> Optional[List[str]]:
-        return ["title", "originaltitle", "sorttitle", "set", "mpaa", "plot", "tagline", "rating", "releasedate",
-                "studio", "director", "writer", "genre", "actor"]
-
-    @staticmethod
-    def from_xml(root: Element) -> "Movie":
-        movie = Movie()
-        mapping = Movie._mapping()
-        for attr in Movie._get_attribute_order_list():
-            attr_key = attr
-            for key, value in mapping.items():
-                if value == attr:
-                    attr_key = key
-                    break
-            elements = root.findall(attr)  # type: List[Element]
-            if len(elements) == 0:
-                continue
-            try:
-                if attr_key == "rating":
-                    setattr(movie, attr_key, float(elements[0].text))
-                elif attr_key in ["sets", "genres", "directors", "writers"]:
-                    setattr(movie, attr_key, [e.text for e in elements])
-                elif attr_key == "actors":
-                    setattr(movie, attr_key, [Actor.from_xml(e) for e in elements])
-                elif attr_key == "release_date":
-                    setattr(movie, attr_key, datetime.strptime(elements[0].text, "%Y-%m-%d").date())
-                else:
-                    setattr(movie, attr_key, elements[0].text)
-            except TypeError:
-                pass
-        return movie
-
 
 __all__ = [Model, Episode, Show, Movie, Actor]
@@ -1,5 +1,7 @@
+import re
 import unicodedata
-from typing import Dict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Tuple
 
 from avalonplex_core.utils import invert_dict
 
@@ -11,19 +13,31 @@ def replace_words(source: str, replacement: Dict[str, str]) -> str:
     return result
 
 
+def _replace_all(source: str, rules: Tuple[Tuple[str, str], ...]) -> str:
+    for word, value in rules:
+        source = source.replace(word, value)
+    return source
+
+
 def normalize(source: str) -> str:
-    content = replace_words(source, _before)
+    content = _replace_all(source, _before_rules)
     content = unicodedata.normalize("NFKC", content)
-    content = replace_words(content, _after).strip()
-    content_source = content
-    content = content.replace("  ", " ")
-    while content != content_source:
-        content_source = content
-        content = content.replace("  ", " ")
-    content = replace_words(content, _after_space)
+    content = _replace_all(content, _after_rules).strip()
+    if "  " in content:
+        content = _spaces.sub(" ", content)
+    if " " in content:
+        content = _replace_all(content, _after_space_rules)
     return content
 
 
+def cached_normalizer(cache_size: int = 4096) -> Callable[[str], str]:
+    return lru_cache(maxsize=cache_size)(normalize)
+
+
+def normalize_many(sources: Iterable[str], normalizer: Callable[[str], str] = normalize) -> List[str]:
+    return [normalizer(source) for source in sources]
+
+
 _before = {
     "～": "$wave%",
     "＆": "&amp;",
@@ -49,4 +63,9 @@ _after_space = {
     "、 ": "、"
 }
 
-__all__ = [normalize]
+_before_rules = tuple(_before.items())  # type: Tuple[Tuple[str, str], ...]
+_after_rules = tuple(_after.items())  # type: Tuple[Tuple[str, str], ...]
+_after_space_rules = tuple(_after_space.items())  # type: Tuple[Tuple[str, str], ...]
+_spaces = re.compile(" {2,}")
+
+__all__ = [normalize, normalize_many, cached_normalizer]
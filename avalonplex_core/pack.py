@@ -0,0 +1,141 @@
+import json
+import struct
+from functools import partial
+from mmap import ACCESS_READ, mmap
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from avalonplex_core.codec import dumps, loads
+from avalonplex_core.model import Model, Episode, Show, Movie
+from avalonplex_core.utils import parallel_map
+
+_magic = b"AVPK"
+_version = 1
+_header = struct.Struct("<4sHH")
+_trailer = struct.Struct("<QQ4s")
+
+
+class PackWriter:
+    def __init__(self, path: str):
+        self.path = path  # type: str
+        self._file = open(path, "wb")  # type: Optional[BinaryIO]
+        self._file.write(_header.pack(_magic, _version, 0))
+        self._offset = _header.size  # type: int
+        self._entries = []  # type: List[Tuple[str, Optional[str], int, int]]
+        self._keys = set()  # type: Set[str]
+
+    def __enter__(self) -> "PackWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, model: Model, key: Optional[str] = None) -> str:
+        if self._file is None:
+            raise ValueError(f"Pack is closed: {self.path}")
+        key = key if key is not None else getattr(model, "title", None)
+        if key is None:
+            raise ValueError(f"A key is required for models without a title: {model!r}")
+        if key in self._keys:
+            raise ValueError(f"Duplicated key: {key}")
+        data = dumps(model, False, False, False, False).encode("utf-8")
+        self._file.write(data)
+        self._entries.append((key, getattr(model, "title", None), self._offset, len(data)))
+        self._keys.add(key)
+        self._offset += len(data)
+        return key
+
+    def add_many(self, items: Iterable[Union[Model, Tuple[Model, str]]]) -> List[str]:
+        return [self.add(*item) if isinstance(item, tuple) else self.add(item) for item in items]
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            index = json.dumps(self._entries, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            self._file.write(index)
+            self._file.write(_trailer.pack(self._offset, len(index), _magic))
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class PackReader:
+    def __init__(self, path: str):
+        self.path = path  # type: str
+        with open(path, "rb") as file:
+            self._map = mmap(file.fileno(), 0, access=ACCESS_READ)  # type: Optional[mmap]
+        try:
+            self._entries = _read_index(self._map, path)  # type: Dict[str, Tuple[Optional[str], int, int]]
+        except BaseException:
+            self._map.close()
+            raise
+        self._titles = {}  # type: Dict[str, List[str]]
+        for key, (title, _, _) in self._entries.items():
+            if title is not None:
+                self._titles.setdefault(title, []).append(key)
+
+    def __enter__(self) -> "PackReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[Tuple[str, Union[Episode, Show, Movie]]]:
+        for key, (_, offset, length) in self._entries.items():
+            yield key, loads(self._map[offset:offset + length])
+
+    def keys(self) -> List[str]:
+        return list(self._entries)
+
+    def __getitem__(self, key: str) -> Union[Episode, Show, Movie]:
+        _, offset, length = self._entries[key]
+        return loads(self._map[offset:offset + length])
+
+    def get(self, key: str, default: Optional[Model] = None) -> Optional[Union[Episode, Show, Movie]]:
+        return self[key] if key in self._entries else default
+
+    def find(self, title: str) -> List[Union[Episode, Show, Movie]]:
+        return [self[key] for key in self._titles.get(title, ())]
+
+    def read_many(self, keys: Optional[Iterable[str]] = None, workers: Optional[int] = None,
+                  chunk_size: int = 256) -> Iterator[Tuple[str, Union[Episode, Show, Movie]]]:
+        keys = self._entries if keys is None else keys
+        spans = ((key, self._entries[key][1], self._entries[key][2]) for key in keys)
+        return parallel_map(partial(_read_chunk, self.path), spans, workers, chunk_size)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def _read_index(buffer: mmap, path: str) -> Dict[str, Tuple[Optional[str], int, int]]:
+    if len(buffer) < _header.size + _trailer.size:
+        raise ValueError(f"Not a pack file: {path}")
+    magic, version, _ = _header.unpack_from(buffer, 0)
+    if magic != _magic:
+        raise ValueError(f"Not a pack file: {path}")
+    if version != _version:
+        raise ValueError(f"Not supported pack version {version}: {path}")
+    offset, length, magic = _trailer.unpack_from(buffer, len(buffer) - _trailer.size)
+    if magic != _magic or offset + length + _trailer.size != len(buffer):
+        raise ValueError(f"Pack file is incomplete or corrupted: {path}")
+    entries = json.loads(buffer[offset:offset + length].decode("utf-8"))
+    return {key: (title, entry_offset, entry_length) for key, title, entry_offset, entry_length in entries}
+
+
+def _read_chunk(path: str, spans: List[Tuple[str, int, int]]) -> List[Tuple[str, Union[Episode, Show, Movie]]]:
+    with open(path, "rb") as file, mmap(file.fileno(), 0, access=ACCESS_READ) as buffer:
+        return [(key, loads(buffer[offset:offset + length])) for key, offset, length in spans]
+
+
+__all__ = [PackWriter, PackReader]
@@ -0,0 +1,244 @@
+import codecs
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from xml.etree.ElementTree import Element, ParseError, TreeBuilder, fromstring, tostring
+from xml.parsers.expat import ExpatError, ParserCreate
+
+from avalonplex_core.model import Model
+from avalonplex_core.schema import Field
+from avalonplex_core.utils import escape_text
+
+_encoding_pattern = re.compile(rb"\s*<\?xml[^>]*?encoding\s*=\s*[\"']([A-Za-z0-9._-]+)[\"']")
+_boms = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be")
+)  # type: Tuple[Tuple[bytes, str], ...]
+_whitespace = b" \t\r\n"
+_indent_unit = "    "
+
+
+def patch_document(data: bytes, changes: Dict[str, Any], get_model_class: Callable[[str], Type[Model]],
+                   ignore_none: bool = True, ignore_empty: bool = True, ignore_blank: bool = True,
+                   trim: bool = True) -> Optional[bytes]:
+    bom, encoding = _detect_encoding(data)
+    buffer = data[len(bom):]
+    if encoding != "utf-8":
+        buffer = buffer.decode(encoding).encode("utf-8")
+    document = _Document(buffer)
+    model_class = get_model_class(document.root.tag)
+    model = model_class()
+    fields = []  # type: List[Field]
+    for name, value in changes.items():
+        field = model_class._schema.by_tag.get(model_class._mapping().get(name, name))
+        if field is None or field.name != name:
+            raise KeyError(f"Unknown field for {model_class.__name__}: {name}")
+        setattr(model, name, value)
+        fields.append(field)
+    # Round-trip the rendering so empty text compares the way it reads back from disk.
+    rendered = fromstring(tostring(model.as_element(ignore_none, ignore_empty, ignore_blank, trim)))  # type: Element
+    by_tag = model_class._schema.by_tag
+    edits = []  # type: List[Tuple[int, int, int, bytes]]
+    expected = []  # type: List[Tuple[Field, Any]]
+    for field in fields:
+        elements = [child for child in rendered if child.tag == field.tag]
+        existing = [index for index, child in enumerate(document.children) if child.tag == field.tag]
+        value = model_class._decode_field(field, elements)
+        try:
+            if len(existing) == len(elements) and \
+                    model_class._decode_field(field, [document.children[index] for index in existing]) == value:
+                continue
+        except ValueError:
+            pass
+        edits.extend(document.edits(existing, elements, field, by_tag))
+        expected.append((field, value))
+    if len(edits) == 0:
+        return None
+    for start, end, _, text in sorted(edits, key=lambda edit: (edit[0], edit[1] > edit[0], edit[2]), reverse=True):
+        buffer = buffer[:start] + text + buffer[end:]
+    result = bom + (buffer if encoding == "utf-8" else buffer.decode("utf-8").encode(encoding, "xmlcharrefreplace"))
+    _verify(result, document.root.tag, model_class, expected)
+    return result
+
+
+class _Span:
+    __slots__ = ("start", "tag_end", "close", "end")
+
+    def __init__(self, start: int):
+        self.start = start  # type: int
+        self.tag_end = start  # type: int
+        self.close = start  # type: int
+        self.end = start  # type: int
+
+    @property
+    def empty(self) -> bool:
+        return self.close == self.end
+
+
+class _Document:
+    def __init__(self, buffer: bytes):
+        self.buffer = buffer  # type: bytes
+        self.root_span = None  # type: Optional[_Span]
+        self.spans = []  # type: List[_Span]
+        self._builder = TreeBuilder()
+        self._depth = 0  # type: int
+        self._open = None  # type: Optional[_Span]
+        self._parser = ParserCreate("utf-8")
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._data
+        for handler in ("CommentHandler", "ProcessingInstructionHandler", "StartCdataSectionHandler",
+                        "EndCdataSectionHandler", "DefaultHandlerExpand"):
+            setattr(self._parser, handler, self._mark)
+        try:
+            self._parser.Parse(buffer, True)
+        except ExpatError as e:
+            error = ParseError(str(e))
+            error.code, error.position = e.code, (e.lineno, e.offset)
+            raise error from None
+        self.root = self._builder.close()  # type: Element
+        self.children = list(self.root)  # type: List[Element]
+        for span in [self.root_span, *self.spans]:
+            if buffer.endswith(b"/>", 0, span.tag_end):
+                span.close = span.end = span.tag_end
+            else:
+                span.end = buffer.index(b">", span.close) + 1
+
+    def _mark(self, *_):
+        if self._open is not None:
+            self._open.tag_end = self._parser.CurrentByteIndex
+            self._open = None
+
+    def _start(self, tag: str, attributes: Dict[str, str]):
+        self._mark()
+        if self._depth < 2:
+            self._open = _Span(self._parser.CurrentByteIndex)
+            if self._depth == 0:
+                self.root_span = self._open
+            else:
+                self.spans.append(self._open)
+        self._depth += 1
+        self._builder.start(tag, attributes)
+
+    def _end(self, tag: str):
+        self._mark()
+        self._depth -= 1
+        if self._depth < 2:
+            span = self.root_span if self._depth == 0 else self.spans[-1]
+            span.close = self._parser.CurrentByteIndex
+        self._builder.end(tag)
+
+    def _data(self, text: str):
+        self._mark()
+        self._builder.data(text)
+
+    def edits(self, existing: List[int], elements: List[Element], field: Field,
+              by_tag: Dict[str, Field]) -> List[Tuple[int, int, int, bytes]]:
+        order = field.order
+        if len(existing) > 0:
+            first = self.spans[existing[0]]
+            if not field.multiple and len(elements) > 0 and len(elements[0]) == 0 and not first.empty and \
+                    len(self.children[existing[0]]) == 0:
+                return [(first.tag_end, first.close, order, escape_text(elements[0].text or "").encode("utf-8"))]
+            edits = [(self._whitespace_before(span.start)[0], span.end, order, b"")
+                     for span in (self.spans[index] for index in existing[1:])]
+            if len(elements) == 0:
+                return [(self._whitespace_before(first.start)[0], first.end, order, b""), *edits]
+            separator = self._whitespace_before(first.start)[1]
+            return [(first.start, first.end, order, separator.join(_render(elements, separator))), *edits]
+        if len(elements) == 0:
+            return []
+        position = _insert_position(self.children, order, by_tag)
+        if position > 0:
+            anchor = self.spans[position - 1]
+            separator = self._whitespace_before(anchor.start)[1]
+            return [(anchor.end, anchor.end, order, b"".join(separator + text
+                                                             for text in _render(elements, separator)))]
+        if len(self.spans) > 0:
+            start, separator = self._whitespace_before(self.spans[0].start)
+            return [(start, start, order, b"".join(separator + text for text in _render(elements, separator)))]
+        root = self.root_span
+        if root.empty:
+            start = self._whitespace_before(root.tag_end - 2)[0]
+            closing = f"></{self.root.tag}>".encode("utf-8")
+            return [(start, root.tag_end, order, closing[:1] + b"".join(_render(elements, b"")) + closing[1:])]
+        start, inner = self._whitespace_before(root.close)
+        if b"\n" not in inner:
+            return [(root.close, root.close, order, b"".join(_render(elements, b"")))]
+        separator = b"\n" + self._whitespace_before(root.start)[1].rpartition(b"\n")[2] + _indent_unit.encode("utf-8")
+        return [(start, start, order, b"".join(separator + text for text in _render(elements, separator)))]
+
+    def _whitespace_before(self, index: int) -> Tuple[int, bytes]:
+        start = index
+        while start > 0 and self.buffer[start - 1] in _whitespace:
+            start -= 1
+        return start, self.buffer[start:index]
+
+
+def _render(elements: List[Element], separator: bytes) -> List[bytes]:
+    inner = separator.decode("utf-8")
+    results = []  # type: List[bytes]
+    for element in elements:
+        if "\n" in inner:
+            _indent(element, inner)
+        results.append(tostring(element, encoding="unicode").encode("utf-8"))
+    return results
+
+
+def _verify(result: bytes, tag: str, model_class: Type[Model], expected: List[Tuple[Field, Any]]):
+    try:
+        root = fromstring(result)  # type: Element
+    except ParseError:
+        root = None
+    if root is None or root.tag != tag or \
+            any(model_class._decode_field(field, [child for child in root if child.tag == field.tag]) != value
+                for field, value in expected):
+        raise ValueError(f"Patched document does not round-trip for <{tag}>")
+
+
+def _detect_encoding(data: bytes) -> Tuple[bytes, str]:
+    for bom, encoding in _boms:
+        if data.startswith(bom):
+            return bom, encoding
+    if data.startswith(b"<\0?\0"):
+        return b"", "utf-16-le"
+    if data.startswith(b"\0<\0?"):
+        return b"", "utf-16-be"
+    declaration = _encoding_pattern.match(data)
+    encoding = declaration.group(1).decode("ascii") if declaration is not None else "utf-8"
+    try:
+        return b"", codecs.lookup(encoding).name
+    except LookupError:
+        raise ValueError(f"Not supported document encoding: {encoding}")
+
+
+def _insert_position(children: List[Element], order: int, by_tag: Dict[str, Field]) -> int:
+    after = None  # type: Optional[int]
+    before = None  # type: Optional[int]
+    for index, child in enumerate(children):
+        field = by_tag.get(child.tag)
+        if field is None:
+            continue
+        if field.order < order:
+            after = index + 1
+        elif before is None:
+            before = index
+    if after is not None:
+        return after
+    return before if before is not None else len(children)
+
+
+def _indent(element: Element, inner: str):
+    if len(element) == 0:
+        return
+    child_inner = inner + inner[inner.rfind("\n") + 1:]
+    element.text = child_inner
+    for child in element:
+        _indent(child, child_inner)
+        child.tail = child_inner
+    element[-1].tail = inner
+
+
+__all__ = [patch_document]
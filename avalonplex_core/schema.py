@@ -0,0 +1,78 @@
+from datetime import date, datetime
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from xml.etree.ElementTree import Element
+
+_decode_str = attrgetter("text")
+
+
+def _decode_int(element: Element) -> int:
+    return int(element.text)
+
+
+def _decode_float(element: Element) -> float:
+    return float(element.text)
+
+
+def _decode_date(element: Element) -> date:
+    return parse_date(element.text)
+
+
+def parse_date(text: str) -> date:
+    if len(text) == 10 and text[4] == "-" and text[7] == "-":
+        year, month, day = text[:4], text[5:7], text[8:]
+        if year.isdigit() and month.isdigit() and day.isdigit():
+            try:
+                return date(int(year), int(month), int(day))
+            except ValueError:
+                pass
+    return datetime.strptime(text, "%Y-%m-%d").date()
+
+
+def format_date(value: date) -> str:
+    if type(value) is date and value.year >= 1000:
+        return value.isoformat()
+    return value.strftime("%Y-%m-%d")
+
+
+_decoders = {
+    str: _decode_str,
+    int: _decode_int,
+    float: _decode_float,
+    date: _decode_date
+}  # type: Dict[type, Callable[[Element], Any]]
+
+
+class Field:
+    def __init__(self, name: str, tag: Optional[str] = None, codec: type = str, multiple: bool = False):
+        self.name = name  # type: str
+        self.tag = tag if tag is not None else name  # type: str
+        self.codec = codec  # type: type
+        self.multiple = multiple  # type: bool
+        self.order = -1  # type: int
+        if codec in _decoders:
+            self.decode = _decoders[codec]  # type: Callable[[Element], Any]
+        elif hasattr(codec, "from_xml"):
+            self.decode = codec.from_xml
+        else:
+            raise TypeError(f"Not supported codec: {codec}")
+
+    def __repr__(self):
+        return f"Field({self.name}, {self.tag}, {self.codec.__name__}, multiple={self.multiple}, order={self.order})"
+
+
+class Schema:
+    def __init__(self, fields: Sequence[Field]):
+        self.fields = tuple(fields)  # type: Tuple[Field, ...]
+        for order, field in enumerate(self.fields):
+            field.order = order
+        self.by_name = {field.name: field for field in self.fields}  # type: Dict[str, Field]
+        self.by_tag = {field.tag: field for field in self.fields}  # type: Dict[str, Field]
+        self.names = tuple(field.name for field in self.fields)  # type: Tuple[str, ...]
+        self.tags = tuple(field.tag for field in self.fields)  # type: Tuple[str, ...]
+        self.mapping = {
+            field.name: field.tag for field in self.fields if field.name != field.tag
+        }  # type: Dict[str, str]
+
+
+__all__ = [Field, Schema, parse_date, format_date]
@@ -1,37 +1,520 @@
+from copy import copy
+from enum import Enum
+from fnmatch import fnmatch
+from functools import partial
+from hashlib import blake2b
+from os import O_CREAT, O_EXCL, O_RDONLY, O_WRONLY, chmod, close, fstat, fsync, linesep, makedirs, \
+    open as os_open, path as os_path, remove, replace, stat, stat_result, write
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
 from typing import Union
-from xml.etree.ElementTree import Element, ElementTree, parse
+from uuid import uuid4
+from time import perf_counter
+from xml.etree.ElementTree import Element, XMLPullParser, fromstring, iterparse, parse
 
+from avalonplex_core.archive import read_archive
+from avalonplex_core.cache import ParseCache, digest
+from avalonplex_core.intern import InternPool
 from avalonplex_core.model import Model, Episode, Show, Movie
+from avalonplex_core.patch import patch_document
+from avalonplex_core.schema import Field
+from avalonplex_core.stats import Stats
+from avalonplex_core.utils import iter_file_stats, iter_files, parallel_map
+
+
+class WriteResult(Enum):
+    CREATED = "created"
+    WRITTEN = "written"
+    SKIPPED = "skipped"
 
 
 class XmlSerializer:
     def __init__(self, encoding: str = "utf-8", short_empty_elements: bool = False, ignore_none: bool = True,
-                 ignore_empty: bool = True, ignore_blank: bool = True, trim: bool = True):
+                 ignore_empty: bool = True, ignore_blank: bool = True, trim: bool = True,
+                 skip_unchanged: bool = False, atomic: bool = False, stats: Optional[Stats] = None,
+                 lazy: bool = False, cache: Optional[ParseCache] = None, intern: Optional[InternPool] = None):
         self.encoding = encoding  # type: str
         self.short_empty_elements = short_empty_elements  # type: bool
         self.ignore_none = ignore_none  # type: bool
         self.ignore_empty = ignore_empty  # type: bool
         self.ignore_blank = ignore_blank  # type: bool
         self.trim = trim  # type: bool
+        self.skip_unchanged = skip_unchanged  # type: bool
+        self.atomic = atomic  # type: bool
+        self.stats = stats  # type: Optional[Stats]
+        self.lazy = lazy  # type: bool
+        self.cache = cache  # type: Optional[ParseCache]
+        self.intern = intern  # type: Optional[InternPool]
+        self._digests = {}  # type: Dict[str, Tuple[int, int, bytes]]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_digests"] = {}
+        state["cache"] = None
+        state["intern"] = None
+        return state
 
-    def serialize(self, model: Model, name: str, folder: Optional[Path] = None):
+    def serialize(self, model: Model, name: str, folder: Optional[Path] = None) -> WriteResult:
         path = str(folder.joinpath(name)) if folder is not None else name
-        root = model.as_element(self.ignore_none, self.ignore_empty, self.ignore_blank, self.trim)  # type: Element
-        tree = ElementTree(element=root)  # type: ElementTree
-        tree.write(path, encoding=self.encoding, short_empty_elements=self.short_empty_elements)
+        stats = self.stats
+        if stats is None:
+            return self._write(path, self.encode(model))
+        start = perf_counter()
+        data = self.encode(model)
+        rendered = perf_counter()
+        result = self._write(path, data)
+        stats.observe("render", rendered - start)
+        stats.observe("write", perf_counter() - rendered)
+        stats.count(f"files_{result.value}")
+        if result is not WriteResult.SKIPPED:
+            stats.count("bytes_written", len(data))
+        stats.count_model("serialize", model._root)
+        return result
+
+    def serialize_many(self, items: Iterable[Tuple[Model, str]], folder: Optional[Path] = None,
+                       workers: Optional[int] = None, chunk_size: int = 64,
+                       sync: bool = False) -> List[Tuple[str, Union[WriteResult, Exception]]]:
+        items = list(items)
+        paths = [str(folder.joinpath(name)) if folder is not None else name for _, name in items]
+        start = perf_counter()
+        encoded = list(parallel_map(partial(_encode_chunk, self), [model for model, _ in items], workers,
+                                    chunk_size))  # type: List[Union[bytes, Exception]]
+        rendered = perf_counter()
+        folders = {os_path.dirname(path) for path in paths} - {""}
+        for target_folder in folders:
+            try:
+                makedirs(target_folder, exist_ok=True)
+            except OSError:
+                pass
+        report = []  # type: List[Tuple[str, Union[WriteResult, Exception]]]
+        for path, data in zip(paths, encoded):
+            if isinstance(data, Exception):
+                report.append((path, data))
+                continue
+            try:
+                report.append((path, self._write(path, data, sync and self.atomic)))
+            except OSError as e:
+                report.append((path, e))
+        if sync:
+            if not self.atomic:
+                _sync_files(report)
+            _sync_folders(folders if len(folders) > 0 else {"."})
+        stats = self.stats
+        if stats is not None:
+            stats.observe("render", rendered - start)
+            stats.observe("write", perf_counter() - rendered)
+            for (model, _), (_, result), data in zip(items, report, encoded):
+                if isinstance(result, WriteResult):
+                    stats.count(f"files_{result.value}")
+                    if result is not WriteResult.SKIPPED:
+                        stats.count("bytes_written", len(data))
+                    stats.count_model("serialize", model._root)
+                else:
+                    stats.count("files_failed")
+        return report
+
+    def serialize_show(self, show: Show, episodes: Iterable[Tuple[Episode, str]], folder: Optional[Path] = None,
+                       name: str = "tvshow.xml", workers: Optional[int] = None, chunk_size: int = 64,
+                       sync: bool = False) -> List[Tuple[str, Union[WriteResult, Exception]]]:
+        return self.serialize_many([(show, name), *episodes], folder, workers, chunk_size, sync)
+
+    def patch(self, path: str, changes: Dict[str, Any]) -> WriteResult:
+        with open(path, "rb") as file:
+            data = file.read()
+        patched = patch_document(data, changes, self._get_model_class, self.ignore_none, self.ignore_empty,
+                                 self.ignore_blank, self.trim)  # type: Optional[bytes]
+        if patched is None:
+            return WriteResult.SKIPPED
+        return self._write(path, patched)
+
+    def patch_many(self, patches: Iterable[Tuple[str, Dict[str, Any]]], workers: Optional[int] = None,
+                   chunk_size: int = 64) -> List[Tuple[str, Union[WriteResult, Exception]]]:
+        return list(parallel_map(partial(_patch_chunk, self), patches, workers, chunk_size))
+
+    def encode(self, model: Model) -> bytes:
+        content = self.render(model)  # type: str
+        if linesep != "\n":
+            content = content.replace("\n", linesep)
+        encoding = self.encoding if self.encoding.lower() != "unicode" else "utf-8"
+        return content.encode(encoding, "xmlcharrefreplace")
+
+    def render(self, model: Model) -> str:
+        content = model.as_xml(self.ignore_none, self.ignore_empty, self.ignore_blank, self.trim,
+                               self.short_empty_elements)  # type: str
+        if self.encoding.lower() not in ("utf-8", "us-ascii", "unicode"):
+            content = f"<?xml version='1.0' encoding='{self.encoding}'?>\n" + content
+        return content
 
     def deserialize(self, path: str) -> Union[Episode, Show, Movie]:
-        root = parse(path).getroot()  # type: Element
-        if root.tag == "episodedetails":
-            return Episode.from_xml(root)
-        elif root.tag == "tvshow":
-            return Show.from_xml(root)
-        elif root.tag == "movie":
-            return Movie.from_xml(root)
+        if self.cache is not None:
+            return self._deserialize_cached(path)
+        if self.stats is None:
+            root = parse(path).getroot()  # type: Element
+            return self._from_root(root)
+        start = perf_counter()
+        with open(path, "rb") as file:
+            data = file.read()
+        self.stats.observe("read", perf_counter() - start)
+        return self.deserialize_bytes(data)
+
+    def deserialize_file(self, file: BinaryIO) -> Union[Episode, Show, Movie]:
+        if self.stats is None:
+            return self._from_root(parse(file).getroot())
+        start = perf_counter()
+        data = file.read()
+        self.stats.observe("read", perf_counter() - start)
+        return self.deserialize_bytes(data)
+
+    def deserialize_bytes(self, data: Union[bytes, bytearray, memoryview]) -> Union[Episode, Show, Movie]:
+        stats = self.stats
+        if stats is None:
+            return self._from_root(fromstring(data))
+        start = perf_counter()
+        root = fromstring(data)
+        parsed = perf_counter()
+        model = self._from_root(root)
+        stats.observe("parse", parsed - start)
+        stats.observe("convert", perf_counter() - parsed)
+        stats.count("bytes_read", len(data))
+        stats.count("elements_parsed", sum(1 for _ in root.iter()))
+        stats.count_model("deserialize", root.tag)
+        return model
+
+    def deserialize_archive(self, source: Union[str, BinaryIO],
+                            pattern: str = "*.xml") -> Iterator[Tuple[str, Union[Episode, Show, Movie, Exception]]]:
+        if isinstance(source, str):
+            with open(source, "rb") as file:
+                yield from read_archive(file, pattern, self.deserialize_bytes, self.deserialize_file)
         else:
-            raise NotImplementedError(f"Not supported root tag: {root.tag}")
+            yield from read_archive(source, pattern, self.deserialize_bytes, self.deserialize_file)
+
+    def iterdeserialize(self, source: Union[str, BinaryIO]) -> Iterator[Union[Episode, Show, Movie]]:
+        parents = []  # type: List[Element]
+        depth = -1  # type: int
+        for event, element in iterparse(source, events=("start", "end")):
+            if event == "start":
+                if depth < 0 and element.tag in _root_tags:
+                    depth = len(parents)
+                parents.append(element)
+                continue
+            parents.pop()
+            if len(parents) == depth:
+                yield self._from_element(element)
+                depth = -1
+                if not self.lazy:
+                    element.clear()
+            elif depth >= 0:
+                continue
+            else:
+                element.clear()
+            if len(parents) > 0:
+                parents[-1].remove(element)
+
+    def deserialize_header(self, path: str, fields: Sequence[str] = ("title", "sort_title", "rating"),
+                           chunk_size: int = 2048) -> Union[Episode, Show, Movie]:
+        parser = XMLPullParser(events=("start",))  # type: XMLPullParser
+        root = None  # type: Optional[Element]
+        by_tag = {}  # type: Dict[str, Field]
+        elements = {}  # type: Dict[str, List[Element]]
+        pending = set()
+        stop_early = False
+        checked = 0
+        with open(path, "rb") as file:
+            while True:
+                chunk = file.read(chunk_size)
+                if len(chunk) == 0:
+                    parser.close()
+                else:
+                    parser.feed(chunk)
+                if root is None:
+                    for _, root in parser.read_events():
+                        break
+                    if root is None:
+                        continue
+                    schema = self._get_model_class(root.tag)._schema
+                    by_tag = {schema.by_name[name].tag: schema.by_name[name] for name in fields
+                              if name in schema.by_name}
+                    elements = {field.name: [] for field in by_tag.values()}
+                    pending = {tag for tag, field in by_tag.items() if not field.multiple}
+                    stop_early = len(pending) == len(by_tag)
+                complete = len(root) if len(chunk) == 0 else len(root) - 1
+                for index in range(checked, complete):
+                    element = root[index]  # type: Element
+                    field = by_tag.get(element.tag)
+                    if field is not None:
+                        elements[field.name].append(element)
+                        pending.discard(element.tag)
+                checked = max(checked, complete)
+                if len(chunk) == 0 or (stop_early and len(pending) == 0):
+                    break
+        return self._get_model_class(root.tag).from_elements(elements)
+
+    def scan(self, root: str, pattern: str = "*.xml", workers: Optional[int] = None, chunk_size: int = 64,
+             ordered: bool = True) -> Iterator[Tuple[str, Union[Episode, Show, Movie, Exception]]]:
+        if self.intern is not None:
+            return self._scan_interned(root, pattern, workers, chunk_size, ordered)
+        if self.cache is not None:
+            return self._scan_cached(root, pattern, workers, chunk_size, ordered)
+        if self.stats is None:
+            deserialize_chunk = partial(_deserialize_chunk, self)
+            return parallel_map(deserialize_chunk, iter_files(root, pattern), workers, chunk_size, ordered)
+        return self._scan_with_stats(root, pattern, workers, chunk_size, ordered)
+
+    def _scan_interned(self, root: str, pattern: str, workers: Optional[int], chunk_size: int,
+                       ordered: bool) -> Iterator[Tuple[str, Union[Episode, Show, Movie, Exception]]]:
+        scanner = copy(self)  # type: XmlSerializer
+        scanner.intern = None
+        intern_model = self.intern.intern_model
+        for path, model in scanner.scan(root, pattern, workers, chunk_size, ordered):
+            yield path, intern_model(model) if isinstance(model, Model) else model
+
+    def _scan_with_stats(self, root: str, pattern: str, workers: Optional[int], chunk_size: int,
+                         ordered: bool) -> Iterator[Tuple[str, Union[Episode, Show, Movie, Exception]]]:
+        deserialize_chunk = partial(_deserialize_chunk_with_stats, self)
+        for results, stats in parallel_map(deserialize_chunk, iter_files(root, pattern), workers, chunk_size,
+                                           ordered):
+            self.stats.merge(stats)
+            yield from results
+
+    def _deserialize_cached(self, path: str) -> Union[Episode, Show, Movie]:
+        current = stat(path)
+        model = self.cache.get(path, current)
+        if model is None:
+            with open(path, "rb") as file:
+                data = file.read()
+            data_digest = digest(data)
+            model = self.cache.get_by_digest(path, current, data_digest)
+        if model is not None:
+            if self.stats is not None:
+                self.stats.count("cache_hits")
+            return self.intern.intern_model(model) if self.intern is not None else model
+        root = fromstring(data)  # type: Element
+        model = self._get_model_class(root.tag).from_xml(root)
+        self.cache.put(path, current, data_digest, model)
+        if self.stats is not None:
+            self.stats.count("cache_misses")
+        return self.intern.intern_model(model) if self.intern is not None else model
+
+    def _scan_cached(self, root: str, pattern: str, workers: Optional[int], chunk_size: int,
+                     ordered: bool) -> Iterator[Tuple[str, Union[Episode, Show, Movie, Exception]]]:
+        index = self.cache.index(os_path.join(root, ""))
+        found = []  # type: List[Tuple[str, bool]]
+        for path, current in iter_file_stats(root, pattern):
+            state = index.pop(path, None)
+            found.append((path, current is not None and state == (current.st_size, current.st_mtime_ns)))
+        stale = [path for path in index if fnmatch(os_path.basename(path), pattern)]
+        if len(stale) > 0:
+            self.cache.discard(stale)
+        hits = [path for path, hit in found if hit]
+        misses = [path for path, hit in found if not hit]
+        if self.stats is not None:
+            self.stats.count("cache_hits", len(hits))
+            self.stats.count("cache_misses", len(misses))
+        cached = self._read_cached(hits)
+        parsed = self._parse_for_cache(misses, workers, chunk_size, ordered)
+        if not ordered:
+            yield from cached
+            yield from parsed
+            return
+        for _, hit in found:
+            yield next(cached) if hit else next(parsed)
+
+    def _read_cached(self, paths: List[str]) -> Iterator[Tuple[str, Union[Episode, Show, Movie, Exception]]]:
+        models = self.cache.get_many(paths)
+        pending = next(models, None)
+        for path in paths:
+            if pending is not None and pending[0] == path:
+                yield pending
+                pending = next(models, None)
+            else:
+                yield from self._parse_for_cache([path], 1, 1, True)
+
+    def _parse_for_cache(self, paths: List[str], workers: Optional[int], chunk_size: int,
+                         ordered: bool) -> Iterator[Tuple[str, Union[Episode, Show, Movie, Exception]]]:
+        if len(paths) == 0:
+            return
+        deserialize_chunk = partial(_deserialize_chunk_for_cache, self)
+        for results, entries, stats in parallel_map(deserialize_chunk, paths, workers, chunk_size, ordered):
+            self.cache.put_many(entries)
+            if stats is not None:
+                self.stats.merge(stats)
+            yield from results
+
+    def _from_element(self, element: Element) -> Union[Episode, Show, Movie]:
+        stats = self.stats
+        if stats is None:
+            return self._from_root(element)
+        start = perf_counter()
+        model = self._from_root(element)
+        stats.observe("convert", perf_counter() - start)
+        stats.count_model("deserialize", element.tag)
+        return model
+
+    def _write(self, path: str, data: bytes, sync: bool = False) -> WriteResult:
+        try:
+            current = stat(path)  # type: Optional[stat_result]
+        except FileNotFoundError:
+            current = None
+        digest = blake2b(data, digest_size=16).digest() if self.skip_unchanged else None  # type: Optional[bytes]
+        if current is not None and digest is not None and self._is_unchanged(path, current, data, digest):
+            return WriteResult.SKIPPED
+        if self.atomic:
+            written = _write_atomic(path, data, current, sync)
+        else:
+            with open(path, "wb") as file:
+                file.write(data)
+                written = fstat(file.fileno())
+        if digest is not None:
+            self._digests[path] = (written.st_size, written.st_mtime_ns, digest)
+        return WriteResult.CREATED if current is None else WriteResult.WRITTEN
+
+    def _is_unchanged(self, path: str, current: stat_result, data: bytes, digest: bytes) -> bool:
+        if current.st_size != len(data):
+            return False
+        cached = self._digests.get(path)
+        if cached is not None and cached[0] == current.st_size and cached[1] == current.st_mtime_ns:
+            return cached[2] == digest
+        with open(path, "rb") as file:
+            existing = file.read()
+        self._digests[path] = (current.st_size, current.st_mtime_ns, blake2b(existing, digest_size=16).digest())
+        return existing == data
+
+    def _from_root(self, root: Element) -> Union[Episode, Show, Movie]:
+        model = self._get_model_class(root.tag).from_xml(root, self.lazy)
+        if self.intern is not None and not self.lazy:
+            self.intern.intern_model(model)
+        return model
+
+    @staticmethod
+    def _get_model_class(tag: str) -> Type[Union[Episode, Show, Movie]]:
+        model_class = _models.get(tag)
+        if model_class is None:
+            raise NotImplementedError(f"Not supported root tag: {tag}")
+        return model_class
+
+
+_models = {
+    "episodedetails": Episode,
+    "tvshow": Show,
+    "movie": Movie
+}  # type: Dict[str, Type[Union[Episode, Show, Movie]]]
+_root_tags = frozenset(_models)
+
+
+def _deserialize_chunk_with_stats(serializer: XmlSerializer, paths: List[str]) -> \
+        List[Tuple[List[Tuple[str, Union[Episode, Show, Movie, Exception]]], Stats]]:
+    local = copy(serializer)  # type: XmlSerializer
+    local.stats = Stats()
+    results = _deserialize_chunk(local, paths)
+    local.stats.count("files_failed", sum(1 for _, result in results if isinstance(result, Exception)))
+    return [(results, local.stats)]
+
+
+def _deserialize_chunk_for_cache(serializer: XmlSerializer, paths: List[str]) -> \
+        List[Tuple[List[Tuple[str, Union[Episode, Show, Movie, Exception]]],
+                   List[Tuple[str, stat_result, bytes, Model]], Optional[Stats]]]:
+    local = copy(serializer)  # type: XmlSerializer
+    local.lazy = False
+    local.stats = Stats() if serializer.stats is not None else None
+    results = []  # type: List[Tuple[str, Union[Episode, Show, Movie, Exception]]]
+    entries = []  # type: List[Tuple[str, stat_result, bytes, Model]]
+    for path in paths:
+        try:
+            current = stat(path)
+            with open(path, "rb") as file:
+                data = file.read()
+            model = local._from_root(fromstring(data))
+            results.append((path, model))
+            entries.append((path, current, digest(data), model))
+        except Exception as e:
+            results.append((path, e))
+    if local.stats is not None:
+        local.stats.count("files_failed", len(results) - len(entries))
+    return [(results, entries, local.stats)]
+
+
+def _encode_chunk(serializer: XmlSerializer, models: List[Model]) -> List[Union[bytes, Exception]]:
+    results = []  # type: List[Union[bytes, Exception]]
+    for model in models:
+        try:
+            results.append(serializer.encode(model))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _sync_files(report: List[Tuple[str, Union[WriteResult, Exception]]]):
+    for index, (path, result) in enumerate(report):
+        if result is not WriteResult.CREATED and result is not WriteResult.WRITTEN:
+            continue
+        try:
+            fd = os_open(path, O_RDONLY)
+            try:
+                fsync(fd)
+            finally:
+                close(fd)
+        except OSError as e:
+            report[index] = (path, e)
+
+
+def _sync_folders(folders: Iterable[str]):
+    for folder in folders:
+        try:
+            fd = os_open(folder, O_RDONLY)
+        except OSError:
+            continue
+        try:
+            fsync(fd)
+        except OSError:
+            pass
+        finally:
+            close(fd)
+
+
+def _patch_chunk(serializer: XmlSerializer,
+                 patches: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, Union[WriteResult, Exception]]]:
+    results = []  # type: List[Tuple[str, Union[WriteResult, Exception]]]
+    for path, changes in patches:
+        try:
+            results.append((path, serializer.patch(path, changes)))
+        except Exception as e:
+            results.append((path, e))
+    return results
+
+
+def _write_atomic(path: str, data: bytes, current: Optional[stat_result], sync: bool = False) -> stat_result:
+    folder, name = os_path.split(path)
+    temp_path = os_path.join(folder, f".{name}.{uuid4().hex}.tmp")
+    fd = os_open(temp_path, O_WRONLY | O_CREAT | O_EXCL, 0o666)
+    try:
+        try:
+            if current is not None:
+                chmod(temp_path, current.st_mode & 0o7777)
+            view = memoryview(data)
+            while len(view) > 0:
+                view = view[write(fd, view):]
+            if sync:
+                fsync(fd)
+            written = fstat(fd)
+        finally:
+            close(fd)
+        replace(temp_path, path)
+    except BaseException:
+        if os_path.exists(temp_path):
+            remove(temp_path)
+        raise
+    return written
+
+
+def _deserialize_chunk(serializer: XmlSerializer,
+                       paths: List[str]) -> List[Tuple[str, Union[Episode, Show, Movie, Exception]]]:
+    results = []  # type: List[Tuple[str, Union[Episode, Show, Movie, Exception]]]
+    for path in paths:
+        try:
+            results.append((path, serializer.deserialize(path)))
+        except Exception as e:
+            results.append((path, e))
+    return results
 
 
-__all__ = [XmlSerializer]
+__all__ = [XmlSerializer, WriteResult]
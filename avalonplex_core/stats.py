@@ -0,0 +1,97 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import Any, DefaultDict, Dict, Iterator, List, Tuple
+
+
+class Stats:
+    def __init__(self):
+        self._lock = Lock()  # type: Lock
+        self.seconds = defaultdict(float)  # type: DefaultDict[str, float]
+        self.calls = defaultdict(int)  # type: DefaultDict[str, int]
+        self.counters = defaultdict(int)  # type: DefaultDict[str, int]
+        self.models = defaultdict(int)  # type: DefaultDict[Tuple[str, str], int]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def observe(self, phase: str, seconds: float):
+        with self._lock:
+            self.seconds[phase] += seconds
+            self.calls[phase] += 1
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def count_model(self, operation: str, root: str):
+        with self._lock:
+            self.models[(operation, root)] += 1
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, perf_counter() - start)
+
+    def merge(self, other: "Stats"):
+        with self._lock:
+            for phase, seconds in other.seconds.items():
+                self.seconds[phase] += seconds
+            for phase, calls in other.calls.items():
+                self.calls[phase] += calls
+            for name, value in other.counters.items():
+                self.counters[name] += value
+            for key, value in other.models.items():
+                self.models[key] += value
+
+    def reset(self):
+        with self._lock:
+            self.seconds.clear()
+            self.calls.clear()
+            self.counters.clear()
+            self.models.clear()
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            models = {}  # type: Dict[str, Dict[str, int]]
+            for (operation, root), value in self.models.items():
+                models.setdefault(operation, {})[root] = value
+            return {
+                "phases": {phase: {"calls": self.calls[phase], "seconds": seconds}
+                           for phase, seconds in self.seconds.items()},
+                "counters": dict(self.counters),
+                "models": models
+            }
+
+    def to_prometheus(self, prefix: str = "avalonplex") -> str:
+        data = self.as_dict()
+        lines = []  # type: List[str]
+        if len(data["phases"]) > 0:
+            lines.append(f"# TYPE {prefix}_phase_seconds_total counter")
+            lines.extend(f'{prefix}_phase_seconds_total{{phase="{phase}"}} {values["seconds"]!r}'
+                         for phase, values in sorted(data["phases"].items()))
+            lines.append(f"# TYPE {prefix}_phase_calls_total counter")
+            lines.extend(f'{prefix}_phase_calls_total{{phase="{phase}"}} {values["calls"]}'
+                         for phase, values in sorted(data["phases"].items()))
+        for name, value in sorted(data["counters"].items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        if len(data["models"]) > 0:
+            lines.append(f"# TYPE {prefix}_models_total counter")
+            lines.extend(f'{prefix}_models_total{{operation="{operation}",type="{root}"}} {value}'
+                         for operation, roots in sorted(data["models"].items())
+                         for root, value in sorted(roots.items()))
+        return "\n".join(lines) + "\n" if len(lines) > 0 else ""
+
+
+__all__ = [Stats]
@@ -1,2 +1,96 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from fnmatch import fnmatch
+from itertools import islice
+from os import cpu_count, scandir, stat_result, walk, path as os_path
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
 def invert_dict(source: dict) -> dict:
     return {v: k for k, v in source.items()}
+
+
+def escape_text(text: str) -> str:
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def iter_files(root: str, pattern: str = "*.xml") -> Iterator[str]:
+    for folder, _, files in walk(root):
+        for name in files:
+            if fnmatch(name, pattern):
+                yield os_path.join(folder, name)
+
+
+def iter_file_stats(root: str, pattern: str = "*.xml") -> Iterator[Tuple[str, Optional[stat_result]]]:
+    stack = [root]
+    while len(stack) > 0:
+        try:
+            with scandir(stack.pop()) as iterator:
+                entries = list(iterator)
+        except OSError:
+            continue
+        folders = []  # type: List[str]
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if not entry.is_symlink():
+                    folders.append(entry.path)
+            elif fnmatch(entry.name, pattern):
+                try:
+                    yield entry.path, entry.stat()
+                except OSError:
+                    yield entry.path, None
+        stack.extend(reversed(folders))
+
+
+def chunked(source: Iterable[T], size: int) -> Iterator[List[T]]:
+    chunk = []  # type: List[T]
+    for item in source:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
+
+
+def parallel_map(func: Callable[[List[T]], List[R]], source: Iterable[T], workers: Optional[int] = None,
+                 chunk_size: int = 64, ordered: bool = True) -> Iterator[R]:
+    chunks = chunked(source, chunk_size)
+    if workers is None:
+        workers = cpu_count() or 1
+    if workers <= 1:
+        for chunk in chunks:
+            yield from func(chunk)
+        return
+    window = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if ordered:
+            pending = deque(executor.submit(func, chunk) for chunk in islice(chunks, window))  # type: Deque[Future]
+            while len(pending) > 0:
+                results = pending.popleft().result()
+                for chunk in islice(chunks, 1):
+                    pending.append(executor.submit(func, chunk))
+                yield from results
+        else:
+            running = {executor.submit(func, chunk) for chunk in islice(chunks, window)}  # type: Set[Future]
+            while len(running) > 0:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                running.update(executor.submit(func, chunk) for chunk in islice(chunks, len(done)))
+                for future in done:
+                    yield from future.result()
+
+
+__all__ = [invert_dict, escape_text, iter_files, iter_file_stats, chunked, parallel_map]
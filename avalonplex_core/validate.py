@@ -0,0 +1,208 @@
+from datetime import date
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+from xml.etree.ElementTree import Element, ParseError, fromstring
+from xml.parsers.expat import ExpatError, ParserCreate
+
+from avalonplex_core.model import Model, Episode, Show, Movie, Actor
+from avalonplex_core.schema import Field, parse_date
+from avalonplex_core.serialize import XmlSerializer
+from avalonplex_core.utils import iter_files, parallel_map
+
+_default_required = {
+    Episode: ("title",),
+    Show: ("title",),
+    Movie: ("title",),
+    Actor: ("name",)
+}  # type: Dict[Type[Model], Tuple[str, ...]]
+_parsers = {
+    int: int,
+    float: float,
+    date: parse_date
+}  # type: Dict[type, Callable[[str], Any]]
+
+
+class Severity(Enum):
+    ERROR = "error"
+    WARNING = "warning"
+
+
+class Diagnostic(NamedTuple):
+    path: str
+    line: int
+    column: int
+    severity: Severity
+    code: str
+    message: str
+
+
+class Validator:
+    def __init__(self, required: Optional[Dict[Type[Model], Sequence[str]]] = None):
+        self.required = {
+            model: tuple(names) for model, names in (required if required is not None else _default_required).items()
+        }  # type: Dict[Type[Model], Tuple[str, ...]]
+
+    def validate(self, path: str) -> List[Diagnostic]:
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError as e:
+            return [Diagnostic(path, 0, 0, Severity.ERROR, "io", str(e))]
+        return self.validate_bytes(data, path)
+
+    def validate_bytes(self, data: Union[bytes, bytearray, memoryview], name: str = "<bytes>") -> List[Diagnostic]:
+        try:
+            if _is_valid(fromstring(data), self.required):
+                return []
+        except ParseError:
+            pass
+        return self.check(data, name)
+
+    def check(self, data: Union[bytes, bytearray, memoryview], name: str = "<bytes>") -> List[Diagnostic]:
+        return self._run(name, lambda parser: parser.Parse(data, True))
+
+    def scan(self, root: str, pattern: str = "*.xml", workers: Optional[int] = None, chunk_size: int = 64,
+             ordered: bool = True) -> Iterator[Tuple[str, List[Diagnostic]]]:
+        return parallel_map(partial(_validate_chunk, self), iter_files(root, pattern), workers, chunk_size, ordered)
+
+    def _run(self, name: str, feed: Callable[[Any], Any]) -> List[Diagnostic]:
+        parser = ParserCreate()
+        parser.buffer_text = True
+        checker = _Checker(name, self.required, parser)
+        parser.StartElementHandler = checker.start
+        parser.EndElementHandler = checker.end
+        parser.CharacterDataHandler = checker.data
+        try:
+            feed(parser)
+        except ExpatError as e:
+            checker.report(e.lineno, e.offset, Severity.ERROR, "syntax", str(e))
+        return checker.diagnostics
+
+
+class _Frame:
+    __slots__ = ("model", "field", "values", "parts", "line", "column")
+
+    def __init__(self, model: Optional[Type[Model]], field: Optional[Field], line: int, column: int):
+        self.model = model  # type: Optional[Type[Model]]
+        self.field = field  # type: Optional[Field]
+        self.values = {} if model is not None else None  # type: Optional[Dict[str, bool]]
+        self.parts = [] if model is None and field is not None else None  # type: Optional[List[str]]
+        self.line = line  # type: int
+        self.column = column  # type: int
+
+
+class _Checker:
+    def __init__(self, name: str, required: Dict[Type[Model], Tuple[str, ...]], parser: Any):
+        self.name = name  # type: str
+        self.required = required  # type: Dict[Type[Model], Tuple[str, ...]]
+        self.parser = parser
+        self.diagnostics = []  # type: List[Diagnostic]
+        self._stack = []  # type: List[_Frame]
+
+    def report(self, line: int, column: int, severity: Severity, code: str, message: str):
+        self.diagnostics.append(Diagnostic(self.name, line, column, severity, code, message))
+
+    def start(self, tag: str, attributes: Dict[str, str]):
+        line, column = self.parser.CurrentLineNumber, self.parser.CurrentColumnNumber
+        stack = self._stack
+        if len(stack) == 0:
+            try:
+                model = XmlSerializer._get_model_class(tag)  # type: Optional[Type[Model]]
+            except NotImplementedError:
+                self.report(line, column, Severity.ERROR, "unknown-root", f"Not supported root tag: <{tag}>")
+                model = None
+            stack.append(_Frame(model, None, line, column))
+            return
+        parent = stack[-1]
+        if parent.model is None:
+            stack.append(_Frame(None, None, line, column))
+            return
+        field = parent.model._schema.by_tag.get(tag)
+        if field is None:
+            self.report(line, column, Severity.WARNING, "unknown-tag", f"Unknown tag <{tag}> in <{parent.model._root}>")
+            stack.append(_Frame(None, None, line, column))
+            return
+        if not field.multiple and tag in parent.values:
+            self.report(line, column, Severity.WARNING, "duplicate-tag",
+                        f"Duplicated <{tag}> in <{parent.model._root}>, only the first one is used")
+        if isinstance(field.codec, type) and issubclass(field.codec, Model):
+            stack.append(_Frame(field.codec, field, line, column))
+        else:
+            stack.append(_Frame(None, field, line, column))
+
+    def data(self, text: str):
+        parts = self._stack[-1].parts
+        if parts is not None:
+            parts.append(text)
+
+    def end(self, tag: str):
+        frame = self._stack.pop()
+        parent = self._stack[-1] if len(self._stack) > 0 else None
+        if frame.model is not None:
+            self._check_required(frame)
+            if parent is not None and parent.values is not None:
+                parent.values.setdefault(tag, True)
+            return
+        if frame.field is None:
+            return
+        text = "".join(frame.parts) if len(frame.parts) > 0 else None
+        parent.values.setdefault(tag, text is not None and len(text.strip()) > 0)
+        parser = _parsers.get(frame.field.codec)
+        if parser is None or text is None:
+            return
+        try:
+            parser(text)
+        except ValueError:
+            self.report(frame.line, frame.column, Severity.ERROR, "invalid-value",
+                        f"Invalid {frame.field.codec.__name__} value in <{tag}>: {text!r}")
+
+    def _check_required(self, frame: _Frame):
+        by_name = frame.model._schema.by_name
+        for name in self.required.get(frame.model, ()):
+            if not frame.values.get(by_name[name].tag, False):
+                self.report(frame.line, frame.column, Severity.ERROR, "missing-required",
+                            f"Missing or empty <{by_name[name].tag}> in <{frame.model._root}>")
+
+
+def _is_valid(root: Element, required: Dict[Type[Model], Tuple[str, ...]]) -> bool:
+    try:
+        model = XmlSerializer._get_model_class(root.tag)  # type: Type[Model]
+    except NotImplementedError:
+        return False
+    return _is_valid_model(root, model, required)
+
+
+def _is_valid_model(element: Element, model: Type[Model], required: Dict[Type[Model], Tuple[str, ...]]) -> bool:
+    by_tag = model._schema.by_tag
+    filled = {}  # type: Dict[str, bool]
+    for child in element:
+        tag = child.tag
+        field = by_tag.get(tag)
+        if field is None or (not field.multiple and tag in filled):
+            return False
+        codec = field.codec
+        if codec in _parsers:
+            text = child.text
+            if text is not None:
+                try:
+                    _parsers[codec](text)
+                except ValueError:
+                    return False
+            filled.setdefault(tag, text is not None and len(text.strip()) > 0)
+        elif codec is str:
+            text = child.text
+            filled.setdefault(tag, text is not None and len(text.strip()) > 0)
+        else:
+            if not _is_valid_model(child, codec, required):
+                return False
+            filled.setdefault(tag, True)
+    by_name = model._schema.by_name
+    return all(filled.get(by_name[name].tag, False) for name in required.get(model, ()))
+
+
+def _validate_chunk(validator: Validator, paths: List[str]) -> List[Tuple[str, List[Diagnostic]]]:
+    return [(path, validator.validate(path)) for path in paths]
+
+
+__all__ = [Validator, Diagnostic, Severity]
@@ -0,0 +1,260 @@
+import ctypes
+import ctypes.util
+import struct
+from enum import Enum
+from fnmatch import fnmatch
+from os import close, fsdecode, fsencode, read, scandir, stat, path as os_path
+from select import select
+from time import monotonic, sleep
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+from avalonplex_core.model import Episode, Show, Movie
+from avalonplex_core.serialize import XmlSerializer
+from avalonplex_core.utils import iter_file_stats
+
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_watch_mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | \
+              _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+_event_header = struct.Struct("iIII")
+
+
+class Change(Enum):
+    ADDED = "added"
+    MODIFIED = "modified"
+    REMOVED = "removed"
+
+
+class ChangeEvent(NamedTuple):
+    change: Change
+    path: str
+    old: Optional[Union[Episode, Show, Movie]]
+    new: Optional[Union[Episode, Show, Movie, Exception]]
+
+
+class LibraryWatcher:
+    def __init__(self, root: str, serializer: Optional[XmlSerializer] = None, pattern: str = "*.xml",
+                 interval: float = 2.0, debounce: float = 0.5, inotify: Optional[bool] = None):
+        self.root = root  # type: str
+        self.serializer = serializer if serializer is not None else XmlSerializer()  # type: XmlSerializer
+        self.pattern = pattern  # type: str
+        self.interval = interval  # type: float
+        self.debounce = debounce  # type: float
+        self.models = {}  # type: Dict[str, Union[Episode, Show, Movie]]
+        self.errors = {}  # type: Dict[str, Exception]
+        self._state = {}  # type: Dict[str, Tuple[int, int]]
+        self._inotify = None  # type: Optional[_Inotify]
+        self._watch_failed = False  # type: bool
+        if inotify is not False:
+            try:
+                self._inotify = _Inotify()
+            except (AttributeError, OSError):
+                if inotify:
+                    raise
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def __enter__(self) -> "LibraryWatcher":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def load(self, workers: Optional[int] = None) -> List[ChangeEvent]:
+        if self._inotify is not None and not self._add_watches(self.root):
+            self.close()
+        snapshot = _snapshot(self.root, self.pattern)
+        events = []  # type: List[ChangeEvent]
+        for path, model in self.serializer.scan(self.root, self.pattern, workers):
+            state = snapshot.get(path) or _stat(path)
+            if state is not None:
+                events.append(self._apply(path, state, model))
+        for path in set(self._state) - set(snapshot):
+            events.append(self._apply(path, None, None))
+        return [event for event in events if event is not None]
+
+    def poll(self, timeout: Optional[float] = None) -> List[ChangeEvent]:
+        if self._inotify is not None:
+            candidates = self._wait_inotify(timeout)
+        else:
+            candidates = self._wait_polling(timeout)
+        return self._update(candidates)
+
+    def watch(self) -> Iterator[ChangeEvent]:
+        while True:
+            yield from self.poll()
+
+    def _wait_inotify(self, timeout: Optional[float]) -> Set[str]:
+        candidates = set()  # type: Set[str]
+        if not self._inotify.wait(timeout):
+            return candidates
+        rescan = self._collect(candidates)
+        while self._inotify.wait(self.debounce):
+            rescan = self._collect(candidates) or rescan
+        if rescan or self._watch_failed:
+            candidates.update(self._state)
+            candidates.update(_snapshot(self.root, self.pattern))
+        if self._watch_failed:
+            self.close()
+        return candidates
+
+    def _collect(self, candidates: Set[str]) -> bool:
+        rescan = False
+        for folder, mask, name in self._inotify.read():
+            if mask & _IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if folder is None or mask & _IN_IGNORED:
+                continue
+            path = os_path.join(folder, name) if name else folder
+            if mask & _IN_ISDIR or mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                prefix = path + os_path.sep
+                candidates.update(known for known in self._state if known.startswith(prefix))
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._watch_failed = not self._add_watches(path) or self._watch_failed
+                    candidates.update(_snapshot(path, self.pattern))
+            elif fnmatch(name, self.pattern):
+                candidates.add(path)
+        return rescan
+
+    def _wait_polling(self, timeout: Optional[float]) -> Set[str]:
+        deadline = monotonic() + timeout if timeout is not None else None  # type: Optional[float]
+        while True:
+            snapshot = _snapshot(self.root, self.pattern)
+            candidates = {path for path, state in snapshot.items() if self._state.get(path) != state}
+            candidates.update(path for path in self._state if path not in snapshot)
+            if len(candidates) > 0:
+                break
+            if deadline is not None and monotonic() + self.interval > deadline:
+                return candidates
+            sleep(self.interval)
+        while True:
+            sleep(self.debounce)
+            settled = {path: _stat(path) for path in candidates}
+            if all(settled[path] == snapshot.get(path) for path in candidates):
+                return candidates
+            snapshot.update(settled)
+
+    def _update(self, candidates: Set[str]) -> List[ChangeEvent]:
+        events = []  # type: List[ChangeEvent]
+        for path in sorted(candidates):
+            state = _stat(path)
+            if state == self._state.get(path):
+                continue
+            if state is None:
+                event = self._apply(path, None, None)
+            else:
+                try:
+                    event = self._apply(path, state, self.serializer.deserialize(path))
+                except Exception as e:
+                    event = self._apply(path, state, e)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _apply(self, path: str, state: Optional[Tuple[int, int]],
+               model: Optional[Union[Episode, Show, Movie, Exception]]) -> Optional[ChangeEvent]:
+        known = path in self._state
+        old = self.models.pop(path, None)
+        self.errors.pop(path, None)
+        if state is None:
+            self._state.pop(path, None)
+            return ChangeEvent(Change.REMOVED, path, old, None) if known else None
+        self._state[path] = state
+        if isinstance(model, Exception):
+            self.errors[path] = model
+        else:
+            self.models[path] = model
+        return ChangeEvent(Change.MODIFIED if known else Change.ADDED, path, old, model)
+
+    def _add_watches(self, root: str) -> bool:
+        stack = [root]
+        while len(stack) > 0:
+            folder = stack.pop()
+            try:
+                self._inotify.add(folder)
+                with scandir(folder) as entries:
+                    stack.extend(entry.path for entry in entries if entry.is_dir(follow_symlinks=False))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            except OSError:
+                return False
+        return True
+
+
+class _Inotify:
+    def __init__(self):
+        name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(name, use_errno=True) if name is not None else None
+        if libc is None or not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)  # type: int
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._folders = {}  # type: Dict[int, str]
+
+    def add(self, folder: str):
+        wd = self._libc.inotify_add_watch(self._fd, fsencode(folder), _watch_mask)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_add_watch failed for {folder}")
+        self._folders[wd] = folder
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        return len(select([self._fd], [], [], timeout)[0]) > 0
+
+    def read(self) -> Iterator[Tuple[Optional[str], int, str]]:
+        while True:
+            try:
+                data = read(self._fd, 65536)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _event_header.unpack_from(data, offset)
+                offset += _event_header.size
+                name = fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                folder = self._folders.get(wd)
+                if mask & _IN_IGNORED:
+                    self._folders.pop(wd, None)
+                yield folder, mask, name
+
+    def close(self):
+        close(self._fd)
+
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        result = stat(path)
+    except OSError:
+        return None
+    return result.st_size, result.st_mtime_ns
+
+
+def _snapshot(root: str, pattern: str) -> Dict[str, Tuple[int, int]]:
+    return {path: (result.st_size, result.st_mtime_ns) for path, result in iter_file_stats(root, pattern)
+            if result is not None}
+
+
+__all__ = [LibraryWatcher, ChangeEvent, Change]
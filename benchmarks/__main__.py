@@ -0,0 +1,46 @@
+import json
+import sys
+from argparse import ArgumentParser
+
+from benchmarks.suite import run, compare, load, dump
+from benchmarks.synthetic import LibraryGenerator
+
+
+def main() -> int:
+    parser = ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--shows", type=int, default=20)
+    parser.add_argument("--episodes", type=int, default=12, help="episodes per show")
+    parser.add_argument("--movies", type=int, default=50)
+    parser.add_argument("--actors", type=int, default=8, help="actors per show or movie")
+    parser.add_argument("--seed", type=int, default=20091006)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--only", nargs="*", default=[], help="benchmark names to run")
+    parser.add_argument("--output", help="write results as JSON to this file instead of stdout")
+    parser.add_argument("--baseline", help="compare against a stored baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+    if args.save_baseline and args.baseline is None:
+        parser.error("--save-baseline requires --baseline")
+
+    library = LibraryGenerator(args.seed).generate(args.shows, args.episodes, args.movies, args.actors)
+    result = run(library, args.rounds, args.only)
+    if args.output is not None:
+        dump(result, args.output)
+    else:
+        json.dump(result, sys.stdout, indent=2, sort_keys=True)
+        print()
+    if args.baseline is None:
+        return 0
+    if args.save_baseline:
+        dump(result, args.baseline)
+        return 0
+    regressions = compare(result, load(args.baseline), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression.name}.{regression.metric}: {regression.baseline:.6g} -> "
+              f"{regression.current:.6g} ({regression.change:+.1%})", file=sys.stderr)
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import tracemalloc
+from datetime import date
+from typing import Callable, Dict, List
+
+from avalonplex_core.model import Model, Episode, Show, Movie, Actor
+
+_count = 100000
+
+
+def _dict_class(cls: type) -> type:
+    return type(f"Dict{cls.__name__}", (), {"__init__": cls.__init__})
+
+
+def _samples() -> Dict[type, Callable[[type], object]]:
+    return {
+        Actor: lambda cls: cls("小野大輔", "皐月駆", "https://example.com/cast/小野大輔.jpg"),
+        Episode: lambda cls: cls("赤い夜", 1, date(2009, 10, 7), "TV-14", "plot", ["下田正美"], ["金巻兼一"], 5.0),
+        Show: lambda cls: cls("11eyes", "11eyes", "いれぶんあいず", ["11eyes"], "TV-14", "plot", "11eyes", 4.2,
+                              date(2009, 10, 6), "動画工房", ["憂鬱", "ハーレム"], []),
+        Movie: lambda cls: cls("Fate", "Fate", "ふぇいと", ["Fate/stay night"], "PG12", "plot", "tag", 6.8,
+                               date(2010, 1, 23), "スタジオディーン", ["山口祐司"], ["佐藤卓哉"], ["魔法"], [])
+    }
+
+
+def measure(factory: Callable[[], object], count: int = _count) -> int:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory() for _ in range(count)]  # type: List[object]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del objects
+    return after - before
+
+
+def run(count: int = _count) -> Dict[str, Dict[str, int]]:
+    results = {}  # type: Dict[str, Dict[str, int]]
+    for cls, sample in _samples().items():  # type: type, Callable[[type], Model]
+        dict_cls = _dict_class(cls)
+        dict_bytes = measure(lambda: sample(dict_cls), count)
+        slots_bytes = measure(lambda: sample(cls), count)
+        results[cls.__name__] = {"dict": dict_bytes, "slots": slots_bytes, "saved": dict_bytes - slots_bytes}
+    return results
+
+
+def main():
+    print(f"{'model':<10}{'__dict__':>14}{'__slots__':>14}{'saved':>14}  (bytes per {_count} objects)")
+    for name, result in run().items():
+        print(f"{name:<10}{result['dict']:>14,}{result['slots']:>14,}{result['saved']:>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import json
+import platform
+import tracemalloc
+from os import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence
+from xml.etree.ElementTree import Element, fromstring
+
+from avalonplex_core.codec import dumps, loads
+from avalonplex_core.model import Model, Episode, Show, Movie
+from avalonplex_core.normalize import normalize
+from avalonplex_core.serialize import XmlSerializer
+from benchmarks.synthetic import Library
+
+
+_names = ("as_element", "as_xml", "dumps", "loads", "serialize", "deserialize", "episode_from_xml", "show_from_xml",
+          "movie_from_xml", "normalize")
+
+
+class Case(NamedTuple):
+    name: str
+    func: Callable[[Any], Any]
+    items: Sequence[Any]
+
+
+class Regression(NamedTuple):
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    if len(ordered) == 0:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def measure(case: Case, rounds: int = 3) -> Dict[str, float]:
+    func = case.func
+    latencies = []  # type: List[float]
+    for _ in range(rounds):
+        for item in case.items:
+            start = perf_counter()
+            func(item)
+            latencies.append(perf_counter() - start)
+    tracemalloc.start()
+    try:
+        for item in case.items:
+            func(item)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    total = sum(latencies)
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": len(latencies) / total if total > 0 else 0.0,
+        "p50_us": _percentile(latencies, 50) * 1e6,
+        "p95_us": _percentile(latencies, 95) * 1e6,
+        "p99_us": _percentile(latencies, 99) * 1e6,
+        "peak_memory_bytes": peak
+    }
+
+
+def cases(library: Library, folder: str, only: Sequence[str] = ()) -> List[Case]:
+    selected = {name for name in _names if len(only) == 0 or name in only}
+    serializer = XmlSerializer()
+    models = [*library.shows, *library.episodes, *library.movies]  # type: List[Model]
+    result = []  # type: List[Case]
+    if "as_element" in selected:
+        result.append(Case("as_element", lambda model: model.as_element(), models))
+    if "as_xml" in selected:
+        result.append(Case("as_xml", lambda model: model.as_xml(), models))
+    if "dumps" in selected:
+        result.append(Case("dumps", dumps, models))
+    if "loads" in selected:
+        result.append(Case("loads", loads, [dumps(model) for model in models]))
+    if "serialize" in selected or "deserialize" in selected:
+        files = []  # type: List[str]
+        for index, model in enumerate(models):
+            file = path.join(folder, f"{index}.xml")
+            serializer.serialize(model, file)
+            files.append(file)
+        if "serialize" in selected:
+            result.append(Case("serialize", lambda item: serializer.serialize(item[1], item[0]),
+                               list(zip(files, models))))
+        if "deserialize" in selected:
+            result.append(Case("deserialize", serializer.deserialize, files))
+    for name, cls in (("episode_from_xml", Episode), ("show_from_xml", Show), ("movie_from_xml", Movie)):
+        if name in selected:
+            elements = [fromstring(model.as_xml()) for model in models if type(model) is cls]  # type: List[Element]
+            result.append(Case(name, cls.from_xml, elements))
+    if "normalize" in selected:
+        texts = [text for model in models for text in (model.title, model.plot, getattr(model, "studio", None))
+                 if text is not None]  # type: List[str]
+        result.append(Case("normalize", normalize, texts))
+    return result
+
+
+def run(library: Library, rounds: int = 3, only: Sequence[str] = ()) -> Dict[str, Any]:
+    results = {}  # type: Dict[str, Dict[str, float]]
+    with TemporaryDirectory() as folder:
+        for case in cases(library, folder, only):
+            results[case.name] = measure(case, rounds)
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "library": {"shows": len(library.shows), "episodes": len(library.episodes), "movies": len(library.movies)},
+        "results": results
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2) -> List[Regression]:
+    regressions = []  # type: List[Regression]
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        base = baseline["results"][name]
+        for metric, higher_is_better in [("ops_per_sec", True), ("p95_us", False), ("peak_memory_bytes", False)]:
+            if metric not in base or base[metric] == 0:
+                continue
+            change = (result[metric] - base[metric]) / base[metric]
+            if (higher_is_better and change < -threshold) or (not higher_is_better and change > threshold):
+                regressions.append(Regression(name, metric, base[metric], result[metric], change))
+    return regressions
+
+
+def load(file: str) -> Dict[str, Any]:
+    with open(file, "r", encoding="utf-8") as source:
+        return json.load(source)
+
+
+def dump(result: Dict[str, Any], file: str):
+    with open(file, "w", encoding="utf-8") as target:
+        json.dump(result, target, indent=2, sort_keys=True)
+        target.write("\n")
+
+
+__all__ = [Case, Regression, measure, cases, run, compare, load, dump]
@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+from random import Random
+from typing import List, NamedTuple
+
+from avalonplex_core.model import Episode, Show, Movie, Actor
+
+_kana = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん"
+_kanji = "赤夜皐月駆幼馴染水奈瀬平凡生活送辛過去背負匡香央里明二人学異世界迷込街焼尽災害発全失魔術師名乗鍛錬重聖杯戦争"
+_punctuation = "、、、。。…！？ "
+_latin = "abcdefghijklmnopqrstuvwxyz"
+_studios = ["動画工房", "スタジオディーン", "京都アニメーション", "ufotable", "シャフト", "Production I.G", "MAPPA"]
+_genres = ["憂鬱", "ハーレム", "エロい", "現代ファンタジー", "アクション", "魔法", "ファンタジー", "SF", "日常", "ロボット"]
+_ratings = ["TV-14", "TV-MA", "PG12", "R15+", "G"]
+
+
+class Library(NamedTuple):
+    shows: List[Show]
+    episodes: List[Episode]
+    movies: List[Movie]
+
+
+class LibraryGenerator:
+    def __init__(self, seed: int = 20091006, actor_pool: int = 2000):
+        self._random = Random(seed)  # type: Random
+        self._actors = [self._name(2, 4) for _ in range(actor_pool)]  # type: List[str]
+
+    def generate(self, shows: int = 20, episodes_per_show: int = 12, movies: int = 50,
+                 actors_per_title: int = 8) -> Library:
+        show_list = []  # type: List[Show]
+        episode_list = []  # type: List[Episode]
+        for _ in range(shows):
+            show = self.show(actors_per_title)
+            show_list.append(show)
+            episode_list.extend(self.episode(show, number) for number in range(1, episodes_per_show + 1))
+        movie_list = [self.movie(actors_per_title) for _ in range(movies)]
+        return Library(show_list, episode_list, movie_list)
+
+    def show(self, actors: int) -> Show:
+        title = self._title()
+        return Show(title, title, self._name(4, 12), self._sample([title + "シリーズ"], 0, 1),
+                    self._random.choice(_ratings), self.plot(), self._title(), self._rating(), self._date(),
+                    self._random.choice(_studios), self._sample(_genres, 1, 5), self._actor_list(actors))
+
+    def episode(self, show: Show, number: int) -> Episode:
+        aired = show.premiered + timedelta(days=7 * (number - 1)) if show.premiered is not None else None
+        return Episode(self._title(), number, aired, show.mpaa, self.plot(), [self._name(2, 4)],
+                       [self._name(2, 4)], self._rating())
+
+    def movie(self, actors: int) -> Movie:
+        title = self._title()
+        return Movie(title, title, self._name(4, 16), self._sample([title + " Collection"], 0, 1),
+                     self._random.choice(_ratings), self.plot(), self._title(), self._rating(), self._date(),
+                     self._random.choice(_studios), [self._name(2, 4)], [self._name(2, 4)],
+                     self._sample(_genres, 1, 4), self._actor_list(actors))
+
+    def plot(self, paragraphs: int = 3) -> str:
+        return "\n\n".join(self._sentence(40, 120) for _ in range(self._random.randint(1, paragraphs)))
+
+    def _actor_list(self, count: int) -> List[Actor]:
+        return [Actor(name, self._name(2, 5), f"https://example.com/cast/{name}.jpg")
+                for name in self._random.sample(self._actors, min(count, len(self._actors)))]
+
+    def _sentence(self, minimum: int, maximum: int) -> str:
+        alphabet = self._random.choice([_kana + _kanji + _punctuation, _kana + _kanji + _latin + " "])
+        return "".join(self._random.choice(alphabet) for _ in range(self._random.randint(minimum, maximum))) + "。"
+
+    def _name(self, minimum: int, maximum: int) -> str:
+        return "".join(self._random.choice(_kanji + _kana) for _ in range(self._random.randint(minimum, maximum)))
+
+    def _title(self) -> str:
+        if self._random.random() < 0.3:
+            return "".join(self._random.choice(_latin) for _ in range(self._random.randint(4, 12))).title()
+        return self._name(3, 10)
+
+    def _rating(self) -> float:
+        return round(self._random.uniform(1, 10), 1)
+
+    def _date(self) -> date:
+        return date(1990, 1, 1) + timedelta(days=self._random.randint(0, 12000))
+
+    def _sample(self, source: List[str], minimum: int, maximum: int) -> List[str]:
+        return self._random.sample(source, self._random.randint(minimum, min(maximum, len(source))))
+
+
+__all__ = [Library, LibraryGenerator]
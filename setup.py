@@ -5,4 +5,4 @@ setup(name="avalonplex-core",
       author="Avalon Plex",
       url="https://github.com/AvalonPlex/avalonplex-core",
       python_requires=">=3.6",
-      packages=find_packages(exclude=["tests"]))
+      packages=find_packages(exclude=["tests", "benchmarks"]))
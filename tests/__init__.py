@@ -1 +1,18 @@
 from tests.serialize import *
+from tests.schema import *
+from tests.model import *
+from tests.normalize import *
+from tests.aio import *
+from tests.benchmark import *
+from tests.stats import *
+from tests.lazy import *
+from tests.index import *
+from tests.cache import *
+from tests.codec import *
+from tests.intern import *
+from tests.patch import *
+from tests.archive import *
+from tests.watch import *
+from tests.pack import *
+from tests.validate import *
+from tests.utils import *
@@ -0,0 +1,69 @@
+from asyncio import new_event_loop
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from tempfile import TemporaryDirectory
+from threading import Lock
+from time import sleep
+from unittest import TestCase
+
+from avalonplex_core.aio import AsyncXmlSerializer
+from avalonplex_core.serialize import WriteResult
+from avalonplex_core.stats import Stats
+from tests.serialize import test_episode, test_show, test_movie
+
+__all__ = ["TestAsyncSerializer"]
+
+
+class _CountingSerializer(AsyncXmlSerializer):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = Lock()
+        self.active = 0
+        self.peak = 0
+
+    def deserialize(self, path: str):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        sleep(0.01)
+        try:
+            return super().deserialize(path)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def _run(coroutine):
+    loop = new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAsyncSerializer(TestCase):
+    def test_round_trip(self):
+        x = AsyncXmlSerializer(skip_unchanged=True)
+        models = [test_episode, test_show, test_movie]
+        with TemporaryDirectory() as folder:
+            names = [path.join(folder, f"{i}.xml") for i in range(len(models))]
+            results = _run(x.aserialize_many(zip(models, names)))
+            self.assertEqual(results, [WriteResult.CREATED] * 3)
+            self.assertEqual(_run(x.aserialize(test_episode, names[0])), WriteResult.SKIPPED)
+            self.assertEqual(_run(x.adeserialize_many(names)), models)
+            self.assertEqual(_run(x.adeserialize(names[1])), test_show)
+
+    def test_forwards_options(self):
+        stats = Stats()
+        x = AsyncXmlSerializer(max_concurrency=3, encoding="utf-16", lazy=True, stats=stats)
+        self.assertEqual((x.encoding, x.lazy, x.stats, x.max_concurrency), ("utf-16", True, stats, 3))
+        self.assertRaises(TypeError, AsyncXmlSerializer, unknown=True)
+        self.assertRaises(ValueError, AsyncXmlSerializer, max_concurrency=0)
+
+    def test_bounded_concurrency(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            x = _CountingSerializer(executor=executor, max_concurrency=2)
+            results = _run(x.adeserialize_many(["example/episode.xml"] * 8 + ["missing.xml"], return_exceptions=True))
+        self.assertEqual(results[:8], [test_episode] * 8)
+        self.assertIsInstance(results[8], FileNotFoundError)
+        self.assertLessEqual(x.peak, 2)
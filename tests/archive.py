@@ -0,0 +1,109 @@
+import tarfile
+from io import BytesIO
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from zipfile import ZIP_DEFLATED, ZIP_STORED, BadZipFile, ZipFile
+
+from avalonplex_core.serialize import XmlSerializer
+from avalonplex_core.stats import Stats
+from tests.serialize import test_episode, test_show, test_movie
+
+__all__ = ["TestArchive"]
+
+_members = {
+    "show/tvshow.xml": "example/tvshow.xml",
+    "show/s01e01.xml": "example/episode.xml",
+    "movie (2010).xml": "example/movie (2010).xml"
+}
+
+
+def _read(file: str) -> bytes:
+    with open(file, "rb") as source:
+        return source.read()
+
+
+class TestArchive(TestCase):
+    def setUp(self):
+        self.folder = TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def assertMembers(self, results, expected=None):
+        expected = expected if expected is not None else [test_show, test_episode, test_movie]
+        self.assertEqual([name for name, _ in results], list(_members))
+        self.assertEqual([model for _, model in results], expected)
+
+    def write_zip(self, compression: int) -> str:
+        target = path.join(self.folder.name, "library.zip")
+        with ZipFile(target, "w", compression) as archive:
+            archive.writestr("show/", b"")
+            for name, source in _members.items():
+                archive.writestr(name, _read(source))
+            archive.writestr("readme.txt", b"not xml")
+        return target
+
+    def write_tar(self, mode: str) -> str:
+        target = path.join(self.folder.name, "library.tar")
+        with tarfile.open(target, mode) as archive:
+            for name, source in _members.items():
+                archive.add(source, name)
+            archive.add("example", "folder", recursive=False)
+        return target
+
+    def test_deserialize_bytes(self):
+        x = XmlSerializer()
+        data = _read("example/movie (2010).xml")
+        self.assertEqual(x.deserialize_bytes(data), test_movie)
+        self.assertEqual(x.deserialize_bytes(memoryview(b"  " + data)[2:]), test_movie)
+        with open("example/tvshow.xml", "rb") as file:
+            self.assertEqual(x.deserialize_file(file), test_show)
+
+    def test_deserialize_bytes_stats(self):
+        stats = Stats()
+        x = XmlSerializer(stats=stats)
+        with open("example/tvshow.xml", "rb") as file:
+            self.assertEqual(x.deserialize_file(file), test_show)
+        self.assertEqual(stats.counters["bytes_read"], len(_read("example/tvshow.xml")))
+        self.assertEqual(stats.calls["read"], 1)
+        self.assertEqual(stats.calls["parse"], 1)
+
+    def test_zip(self):
+        for compression in (ZIP_STORED, ZIP_DEFLATED):
+            target = self.write_zip(compression)
+            self.assertMembers(list(XmlSerializer().deserialize_archive(target)))
+            with open(target, "rb") as file:
+                self.assertMembers(list(XmlSerializer().deserialize_archive(BytesIO(file.read()))))
+
+    def test_tar(self):
+        for mode in ("w", "w:gz"):
+            target = self.write_tar(mode)
+            self.assertMembers(list(XmlSerializer().deserialize_archive(target)))
+            with open(target, "rb") as file:
+                self.assertMembers(list(XmlSerializer().deserialize_archive(file)))
+
+    def test_archive_errors(self):
+        target = path.join(self.folder.name, "library.zip")
+        with ZipFile(target, "w") as archive:
+            archive.writestr("broken.xml", b"<movie>")
+            archive.writestr("unknown.xml", b"<unknown />")
+            archive.writestr("movie.xml", _read("example/movie (2010).xml"))
+        results = list(XmlSerializer().deserialize_archive(target))
+        self.assertEqual([name for name, _ in results], ["broken.xml", "unknown.xml", "movie.xml"])
+        self.assertIsInstance(results[1][1], NotImplementedError)
+        self.assertEqual(results[2][1], test_movie)
+        self.assertRaises(tarfile.TarError, list, XmlSerializer().deserialize_archive(BytesIO(b"not an archive")))
+
+    def test_zip_crc(self):
+        target = self.write_zip(ZIP_STORED)
+        with open(target, "r+b") as file:
+            data = file.read()
+            offset = data.index(b"<movie>") + 1
+            file.seek(offset)
+            file.write(b"M")
+        for source in (target, BytesIO(data[:offset] + b"M" + data[offset + 1:])):
+            results = list(XmlSerializer().deserialize_archive(source))
+            self.assertEqual([model for _, model in results[:2]], [test_show, test_episode])
+            self.assertEqual(results[2][0], "movie (2010).xml")
+            self.assertIsInstance(results[2][1], BadZipFile)
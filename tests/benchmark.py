@@ -0,0 +1,45 @@
+from contextlib import redirect_stderr
+from io import StringIO
+from os import listdir
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks.__main__ import main
+from benchmarks.suite import cases, run, compare
+from benchmarks.synthetic import LibraryGenerator
+
+__all__ = ["TestBenchmark"]
+
+
+class TestBenchmark(TestCase):
+    def test_generator(self):
+        library = LibraryGenerator(1).generate(shows=2, episodes_per_show=3, movies=4, actors_per_title=5)
+        self.assertEqual((len(library.shows), len(library.episodes), len(library.movies)), (2, 6, 4))
+        self.assertEqual(library, LibraryGenerator(1).generate(2, 3, 4, 5))
+        self.assertTrue(all(len(movie.actors) == 5 for movie in library.movies))
+
+    def test_run_and_compare(self):
+        library = LibraryGenerator(1).generate(1, 2, 1, 2)
+        result = run(library, rounds=1, only=["as_xml", "normalize"])
+        self.assertEqual(sorted(result["results"]), ["as_xml", "normalize"])
+        self.assertEqual(compare(result, result), [])
+        slower = {"results": {name: {**values, "ops_per_sec": values["ops_per_sec"] / 2}
+                              for name, values in result["results"].items()}}
+        self.assertEqual({regression.name for regression in compare(slower, result)}, {"as_xml", "normalize"})
+
+    def test_cases_build_only_selected(self):
+        library = LibraryGenerator(1).generate(1, 2, 1, 2)
+        with TemporaryDirectory() as folder:
+            self.assertEqual([case.name for case in cases(library, folder, ["as_xml", "movie_from_xml"])],
+                             ["as_xml", "movie_from_xml"])
+            self.assertEqual(listdir(folder), [])
+            self.assertEqual(len(cases(library, folder)), 10)
+            self.assertEqual(len(listdir(folder)), 4)
+
+    def test_save_baseline_requires_baseline(self):
+        with patch("sys.argv", ["benchmarks", "--save-baseline"]), redirect_stderr(StringIO()) as error:
+            with self.assertRaises(SystemExit) as raised:
+                main()
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn("--save-baseline requires --baseline", error.getvalue())
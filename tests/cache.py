@@ -0,0 +1,101 @@
+from os import makedirs, path, remove, utime, stat
+from shutil import copyfile, copytree
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from avalonplex_core.cache import ParseCache
+from avalonplex_core.model import Episode
+from avalonplex_core.serialize import XmlSerializer
+from avalonplex_core.utils import iter_files
+from avalonplex_core.stats import Stats
+from tests.serialize import test_episode, test_show, test_movie
+
+__all__ = ["TestParseCache"]
+
+
+class TestParseCache(TestCase):
+    def setUp(self):
+        self.folder = TemporaryDirectory()
+        self.library = path.join(self.folder.name, "library")
+        self.cache_path = path.join(self.folder.name, "cache.sqlite")
+        copytree("example", self.library)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_scan_reuses_cache(self):
+        with ParseCache(self.cache_path) as cache:
+            stats = Stats()
+            x = XmlSerializer(cache=cache, stats=stats)
+            first = dict(x.scan(self.library, workers=2))
+            self.assertEqual(len(cache), 3)
+            self.assertEqual(stats.counters["cache_misses"], 3)
+            second = dict(x.scan(self.library, workers=2))
+            self.assertEqual(stats.counters["cache_hits"], 3)
+            self.assertEqual(first, second)
+            target = path.join(self.library, "episode.xml")
+            XmlSerializer().serialize(Episode("changed"), target)
+            third = dict(x.scan(self.library, workers=1))
+            self.assertEqual(third[target], Episode("changed"))
+            self.assertEqual(third[path.join(self.library, "tvshow.xml")], test_show)
+            self.assertEqual(stats.counters["cache_hits"], 5)
+
+    def test_deserialize_uses_digest_for_touched_files(self):
+        target = path.join(self.library, "movie (2010).xml")
+        with ParseCache(self.cache_path) as cache:
+            stats = Stats()
+            x = XmlSerializer(cache=cache, stats=stats)
+            self.assertEqual(x.deserialize(target), test_movie)
+            current = stat(target)
+            utime(target, ns=(current.st_atime_ns, current.st_mtime_ns + 10 ** 9))
+            self.assertEqual(x.deserialize(target), test_movie)
+            self.assertEqual(x.deserialize(target), test_movie)
+            self.assertEqual(stats.counters["cache_hits"], 2)
+            self.assertEqual(stats.counters["cache_misses"], 1)
+
+    def test_version_invalidation(self):
+        with ParseCache(self.cache_path) as cache:
+            XmlSerializer(cache=cache).deserialize(path.join(self.library, "episode.xml"))
+            self.assertEqual(len(cache), 1)
+        with ParseCache(self.cache_path) as cache:
+            self.assertEqual(len(cache), 1)
+        with ParseCache(self.cache_path, version="other") as cache:
+            self.assertEqual(len(cache), 0)
+
+    def test_errors_are_not_cached(self):
+        copyfile("example/episode.xml", path.join(self.library, "copy.xml"))
+        with open(path.join(self.library, "broken.xml"), "w", encoding="utf-8") as broken:
+            broken.write("<movie>")
+        with ParseCache(self.cache_path) as cache:
+            results = dict(XmlSerializer(cache=cache).scan(self.library, workers=1))
+            self.assertIsInstance(results[path.join(self.library, "broken.xml")], Exception)
+            self.assertEqual(results[path.join(self.library, "copy.xml")], test_episode)
+            self.assertEqual(len(cache), 4)
+
+    def test_scan_keeps_order(self):
+        for i in range(3):
+            makedirs(path.join(self.library, f"sub{i}"))
+            copyfile("example/episode.xml", path.join(self.library, f"sub{i}", "episode.xml"))
+        expected = list(iter_files(self.library))
+        with ParseCache(self.cache_path) as cache:
+            x = XmlSerializer(cache=cache)
+            x.deserialize(expected[-1])
+            x.deserialize(expected[2])
+            self.assertEqual([p for p, _ in x.scan(self.library, workers=2, chunk_size=1)], expected)
+            self.assertEqual([p for p, _ in x.scan(self.library, workers=1)], expected)
+            cache.discard([expected[0]])
+            self.assertEqual([p for p, _ in x.scan(self.library, workers=1)], expected)
+
+    def test_scan_drops_stale_entries(self):
+        other = path.join(self.folder.name, "other")
+        copytree("example", other)
+        with ParseCache(self.cache_path) as cache:
+            x = XmlSerializer(cache=cache)
+            dict(x.scan(self.library, workers=1))
+            dict(x.scan(other, workers=1))
+            remove(path.join(self.library, "episode.xml"))
+            self.assertEqual(len(dict(x.scan(self.library, workers=1))), 2)
+            self.assertEqual(set(cache.index(path.join(self.library, ""))),
+                             {path.join(self.library, "tvshow.xml"), path.join(self.library, "movie (2010).xml")})
+            self.assertEqual(len(cache.index(path.join(other, ""))), 3)
+            self.assertEqual(len(cache), 5)
@@ -0,0 +1,49 @@
+from datetime import date
+from unittest import TestCase
+
+from avalonplex_core.codec import dumps, loads, dumps_many, loads_many
+from avalonplex_core.model import Episode, Show, Movie, Actor
+from tests.serialize import test_episode, test_show, test_movie
+
+__all__ = ["TestCodec"]
+
+
+class TestCodec(TestCase):
+    def test_as_dict(self):
+        episode = Episode(" Title ", 1, date(2010, 1, 2), "", "  ", ["a", " "], rating=8.5)
+        self.assertEqual(episode.as_dict(), {"title": "Title", "episode": 1, "aired": "2010-01-02",
+                                             "directors": ["a"], "rating": 8.5})
+        self.assertEqual(episode.as_dict(False, False, False, False),
+                         {"title": " Title ", "episode": 1, "aired": "2010-01-02", "mpaa": "", "plot": "  ",
+                          "directors": ["a", " "], "writers": [], "rating": 8.5})
+        self.assertEqual(Show(actors=[Actor("a")]).as_dict(), {"actors": [{"name": "a"}]})
+        self.assertEqual(Episode(aired=date(1, 1, 1)).as_dict(), {"aired": "0001-01-01"})
+
+    def test_from_dict(self):
+        show = Show.from_dict({"title": "a", "premiered": "2010-01-02", "rating": "8", "genres": ["b"],
+                               "actors": [{"name": "c"}, Actor("d")], "unknown": 1})
+        self.assertEqual(show, Show("a", rating=8.0, premiered=date(2010, 1, 2), genres=["b"],
+                                    actors=[Actor("c"), Actor("d")]))
+        self.assertEqual(Movie.from_dict({}), Movie())
+        self.assertRaises(ValueError, Episode.from_dict, {"aired": "someday"})
+
+    def test_round_trip(self):
+        for model in [test_episode, test_show, test_movie, Actor("a", "b", "c"), Movie()]:
+            self.assertEqual(type(model).from_dict(model.as_dict()), model)
+            self.assertEqual(loads(dumps(model)), model)
+            self.assertEqual(loads(dumps(model).encode("utf-8")), model)
+        padded = Movie(" a ", plot="", genres=[" "])
+        self.assertEqual(loads(dumps(padded, False, False, False, False)), padded)
+
+    def test_many(self):
+        models = [test_episode, test_show, test_movie]
+        data = dumps_many(models)
+        self.assertEqual(loads_many(data), models)
+        self.assertEqual(data, f"[{','.join(dumps(model) for model in models)}]")
+        self.assertEqual(loads_many("[]"), [])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, loads, "[]")
+        self.assertRaises(ValueError, loads, '{"movie": {}, "tvshow": {}}')
+        self.assertRaises(NotImplementedError, loads, '{"unknown": {}}')
+        self.assertRaises(ValueError, loads_many, "{}")
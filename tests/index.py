@@ -0,0 +1,50 @@
+from datetime import date
+from unittest import TestCase
+
+from avalonplex_core.index import LibraryIndex
+from avalonplex_core.model import Episode, Movie, Show, Actor
+from tests.serialize import test_episode, test_show, test_movie
+
+__all__ = ["TestLibraryIndex"]
+
+
+class TestLibraryIndex(TestCase):
+    def setUp(self):
+        self.sequel = Movie("Heaven's Feel", sets=["Fate/stay night"], release_date=date(2017, 10, 14),
+                            studio="ufotable", genres=["ファンタジー"], actors=[Actor("杉山紀彰", "衛宮士郎")])
+        self.index = LibraryIndex([test_episode, test_show, test_movie, self.sequel])
+
+    def assertModels(self, result, expected):
+        self.assertEqual(sorted(map(id, result)), sorted(map(id, expected)))
+
+    def test_query(self):
+        self.assertModels(self.index.query(actor="杉山紀彰"), [test_movie, self.sequel])
+        self.assertModels(self.index.query(actor="杉山紀彰", set="Fate/stay night", since=date(2011, 1, 1)),
+                          [self.sequel])
+        self.assertModels(self.index.query(genre=["魔法", "ファンタジー"]), [test_movie])
+        self.assertModels(self.index.query(genre="現代ファンタジー"), [test_show, test_movie])
+        self.assertModels(self.index.query(type=Show), [test_show])
+        self.assertModels(self.index.query(director="下田正美", year=2009), [test_episode])
+        self.assertModels(self.index.query(since=date(2009, 10, 7), until=date(2010, 1, 23)),
+                          [test_episode, test_movie])
+        self.assertModels(self.index.query(writer="佐藤卓哉", studio="動画工房"), [])
+        self.assertModels(self.index.query(), [test_episode, test_show, test_movie, self.sequel])
+        self.assertIs(self.index.query(studio="スタジオディーン")[0], test_movie)
+
+    def test_remove_and_update(self):
+        self.index.remove(test_show)
+        self.assertNotIn(test_show, self.index)
+        self.assertModels(self.index.query(genre="現代ファンタジー"), [test_movie])
+        self.assertNotIn("動画工房", self.index.keys("studio"))
+        self.assertRaises(KeyError, self.index.remove, test_show)
+        self.sequel.studio = "スタジオディーン"
+        self.sequel.release_date = None
+        self.index.update(self.sequel)
+        self.assertModels(self.index.query(studio="スタジオディーン"), [test_movie, self.sequel])
+        self.assertModels(self.index.query(since=date(2011, 1, 1)), [])
+        self.assertEqual(len(self.index), 3)
+        self.assertRaises(ValueError, self.index.add, test_movie)
+
+    def test_equal_models_are_distinct_entries(self):
+        index = LibraryIndex([Episode("a"), Episode("a")])
+        self.assertEqual(len(index.query(type=Episode)), 2)
@@ -0,0 +1,64 @@
+from os import path
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from avalonplex_core.intern import InternPool
+from avalonplex_core.model import Episode, Show, Actor
+from avalonplex_core.serialize import XmlSerializer
+from tests.serialize import test_show
+
+__all__ = ["TestIntern"]
+
+
+class TestIntern(TestCase):
+    def test_intern(self):
+        pool = InternPool()
+        first, second = "".join(["a", "b"]), "".join(["a", "b"])
+        self.assertIsNot(first, second)
+        self.assertIs(pool.intern(first), first)
+        self.assertIs(pool.intern(second), first)
+        self.assertIsNone(pool.intern(None))
+        self.assertEqual(pool.as_dict()["hits"], 1)
+        self.assertEqual(pool.unique_ratio, 0.5)
+        self.assertGreater(pool.saved_bytes, 0)
+        pool.clear()
+        self.assertEqual((len(pool), pool.lookups, pool.hits, pool.saved_bytes), (0, 0, 0, 0))
+
+    def test_intern_model(self):
+        pool = InternPool()
+        episodes = [Episode("".join(["t", "1"]), mpaa="".join(["TV", "-14"]), directors=["".join(["d", "1"])])
+                    for _ in range(2)]
+        for episode in episodes:
+            pool.intern_model(episode)
+        self.assertIs(episodes[0].mpaa, episodes[1].mpaa)
+        self.assertIs(episodes[0].directors[0], episodes[1].directors[0])
+        self.assertIsNot(episodes[0].title, episodes[1].title)
+        self.assertEqual(episodes[0], episodes[1])
+
+    def test_intern_actors(self):
+        shows = [Show(actors=[Actor("".join(["a", "1"]), "r"), Actor("a2")]) for _ in range(2)]
+        for actors in (False, True):
+            pool = InternPool(actors=actors)
+            for show in shows:
+                pool.intern_model(show)
+            self.assertIs(shows[0].actors[0].name, shows[1].actors[0].name)
+            self.assertIs(shows[0].actors[0] is shows[1].actors[0], actors)
+            self.assertEqual(pool.as_dict()["actors"], 2 if actors else 0)
+            self.assertEqual(shows[0], shows[1])
+
+    def test_serializer(self):
+        pool = InternPool(actors=True)
+        x = XmlSerializer(intern=pool)
+        first, second = x.deserialize("example/tvshow.xml"), x.deserialize("example/tvshow.xml")
+        self.assertEqual(first, test_show)
+        self.assertIs(first.studio, second.studio)
+        self.assertIs(first.actors[0], second.actors[0])
+        with TemporaryDirectory() as folder:
+            for index in range(4):
+                copyfile("example/tvshow.xml", path.join(folder, f"{index}.xml"))
+            for workers in (1, 2):
+                shows = [model for _, model in x.scan(folder, workers=workers, chunk_size=1)]
+                self.assertEqual(shows, [test_show] * 4)
+                self.assertTrue(all(show.genres[0] is first.genres[0] for show in shows))
+        self.assertLess(pool.unique_ratio, 0.2)
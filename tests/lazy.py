@@ -0,0 +1,56 @@
+from io import BytesIO
+from os import path
+from pickle import dumps, loads
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from xml.etree.ElementTree import tostring
+
+from avalonplex_core.model import Movie, Show
+from avalonplex_core.serialize import XmlSerializer
+from tests.serialize import test_show, test_movie
+
+__all__ = ["TestLazy"]
+
+
+class TestLazy(TestCase):
+    def test_lazy_deserialize(self):
+        movie = XmlSerializer(lazy=True).deserialize("example/movie (2010).xml")
+        self.assertRaises(AttributeError, Movie.title.__get__, movie)
+        self.assertEqual(movie.title, test_movie.title)
+        self.assertEqual(Movie.title.__get__(movie), test_movie.title)
+        self.assertRaises(AttributeError, Movie.actors.__get__, movie)
+        self.assertEqual(movie.actors, test_movie.actors)
+        self.assertEqual(movie.release_date, test_movie.release_date)
+        self.assertRaises(AttributeError, getattr, movie, "unknown")
+
+    def test_lazy_transparent(self):
+        x = XmlSerializer(lazy=True)
+        show = x.deserialize("example/tvshow.xml")
+        self.assertEqual(hash(x.deserialize("example/tvshow.xml")), hash(test_show))
+        self.assertEqual(tostring(x.deserialize("example/tvshow.xml").as_element()), tostring(test_show.as_element()))
+        self.assertEqual(loads(dumps(x.deserialize("example/tvshow.xml"))), test_show)
+        self.assertEqual(show, test_show)
+        self.assertEqual(x.render(show), XmlSerializer().render(test_show))
+
+    def test_lazy_iterdeserialize(self):
+        with open("example/tvshow.xml", "rb") as example:
+            data = example.read()
+        shows = list(XmlSerializer(lazy=True).iterdeserialize(BytesIO(b"<items>" + data * 3 + b"</items>")))
+        self.assertEqual(shows, [test_show] * 3)
+
+    def test_deserialize_header(self):
+        x = XmlSerializer()
+        movie = x.deserialize_header("example/movie (2010).xml")
+        self.assertEqual(movie, Movie(test_movie.title, sort_title=test_movie.sort_title, rating=test_movie.rating))
+        show = x.deserialize_header("example/tvshow.xml", ["studio", "genres"])
+        self.assertEqual(show, Show(studio=test_show.studio, genres=test_show.genres))
+
+    def test_deserialize_header_stops_early(self):
+        with TemporaryDirectory() as folder:
+            target = path.join(folder, "movie.xml")
+            with open(target, "w", encoding="utf-8") as file:
+                file.write("<movie><title>a</title><sorttitle>b</sorttitle><rating>5</rating>")
+                file.write("<plot>padding</plot>" * 10000)
+                file.write("<broken")
+            self.assertEqual(XmlSerializer().deserialize_header(target), Movie("a", sort_title="b", rating=5.0))
+            self.assertRaises(Exception, XmlSerializer().deserialize, target)
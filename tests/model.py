@@ -0,0 +1,39 @@
+from copy import deepcopy
+from pickle import dumps, loads
+from unittest import TestCase
+
+from avalonplex_core.model import Episode, Show, Movie, Actor
+from tests.serialize import test_episode, test_show, test_movie
+
+__all__ = ["TestModel"]
+
+
+class _TitledMovie(Movie):
+    def __init__(self, title: str):
+        super().__init__(title)
+
+
+class TestModel(TestCase):
+    def test_slots(self):
+        for model in [test_episode, test_show, test_movie, Actor()]:
+            self.assertFalse(hasattr(model, "__dict__"))
+        with self.assertRaises(AttributeError):
+            Episode().unknown = 1
+
+    def test_equality(self):
+        self.assertEqual(deepcopy(test_movie), test_movie)
+        self.assertEqual(loads(dumps(test_show)), test_show)
+        self.assertNotEqual(Show(), Movie())
+        self.assertNotEqual(Episode(title="a"), Episode(title="b"))
+        self.assertNotEqual(Actor(), None)
+
+    def test_pickle(self):
+        self.assertEqual(loads(dumps(test_movie)), test_movie)
+        movie = _TitledMovie("a")
+        movie.plot = "b"
+        self.assertEqual(loads(dumps(movie)), movie)
+
+    def test_hash(self):
+        models = {test_episode, deepcopy(test_episode), test_show, loads(dumps(test_show)), Show(), Movie()}
+        self.assertEqual(len(models), 4)
+        self.assertEqual({test_movie: 1}[deepcopy(test_movie)], 1)
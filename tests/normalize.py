@@ -0,0 +1,53 @@
+import unicodedata
+from random import Random
+from unittest import TestCase
+
+from avalonplex_core.normalize import normalize, normalize_many, cached_normalizer, replace_words, _before, _after, \
+    _after_space
+
+__all__ = ["TestNormalize"]
+
+
+def reference_normalize(source: str) -> str:
+    content = replace_words(source, _before)
+    content = unicodedata.normalize("NFKC", content)
+    content = replace_words(content, _after).strip()
+    content_source = content
+    content = content.replace("  ", " ")
+    while content != content_source:
+        content_source = content
+        content = content.replace("  ", " ")
+    content = replace_words(content, _after_space)
+    return content
+
+
+_fragments = ["～", "＆", "&", "&amp;", "\n", "\n\n", "\t", " ", "  ", "＜", "＞", "<", "...", ".", "．", "・", "、",
+              "。", "!", "！", "?", "？", "$", "$wave%", "wave", "%", "$doubleLineBreak%", "ａ", "ｶ", "a", "皐月", "…"]
+
+
+class TestNormalize(TestCase):
+    def test_equivalence(self):
+        random = Random(20091007)
+        for _ in range(20000):
+            source = "".join(random.choice(_fragments) for _ in range(random.randint(0, 16)))
+            self.assertEqual(normalize(source), reference_normalize(source), repr(source))
+
+    def test_examples(self):
+        self.assertEqual(normalize("ＦＡＴＥ／ｓｔａｙ　ｎｉｇｈｔ ～ ＵＢＷ ＆ more..."), "FATE/stay night ～ UBW ＆ more…")
+        self.assertEqual(normalize("  a\n\nb\nc\t\t d!  e "), "a\n\nbc d!e")
+
+    def test_normalize_many(self):
+        sources = ["ＡＢＣ", "a  b", "ＡＢＣ", "ｶﾀｶﾅ"]
+        expected = [reference_normalize(source) for source in sources]
+        self.assertEqual(normalize_many(sources), expected)
+        self.assertEqual(normalize_many(iter(sources), cached_normalizer(2)), expected)
+
+    def test_normalize_many_keeps_cache(self):
+        normalizer = cached_normalizer(16)
+        normalize_many(["ＡＢＣ", "ｶﾀｶﾅ"], normalizer)
+        self.assertEqual(normalizer.cache_info().hits, 0)
+        self.assertEqual(normalize_many(["ｶﾀｶﾅ"], normalizer), [normalize("ｶﾀｶﾅ")])
+        self.assertEqual(normalizer.cache_info().hits, 1)
+        self.assertEqual(normalizer.cache_info().maxsize, 16)
+        normalizer.cache_clear()
+        self.assertEqual(normalizer.cache_info().currsize, 0)
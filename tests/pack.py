@@ -0,0 +1,65 @@
+from datetime import date
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from avalonplex_core.model import Episode, Show, Movie, Actor
+from avalonplex_core.pack import PackWriter, PackReader
+from tests.serialize import test_episode, test_show, test_movie
+
+__all__ = ["TestPack"]
+
+
+class TestPack(TestCase):
+    def setUp(self):
+        self.folder = TemporaryDirectory()
+        self.target = path.join(self.folder.name, "library.pack")
+        self.models = {
+            "show/tvshow.xml": test_show,
+            "show/s01e01.xml": test_episode,
+            "movie.xml": test_movie,
+            "empty.xml": Movie(),
+            "padded.xml": Show(" a ", plot="", genres=[" "], actors=[Actor(role=" ")], premiered=date(1, 1, 1))
+        }
+        with PackWriter(self.target) as writer:
+            for key, model in self.models.items():
+                writer.add(model, key)
+            self.assertEqual(writer.add(Episode("title only")), "title only")
+        self.models["title only"] = Episode("title only")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_round_trip(self):
+        with PackReader(self.target) as reader:
+            self.assertEqual(len(reader), len(self.models))
+            self.assertEqual(reader.keys(), list(self.models))
+            self.assertEqual(dict(reader), self.models)
+            for key, model in self.models.items():
+                self.assertIn(key, reader)
+                self.assertEqual(reader[key], model)
+            self.assertEqual(reader.find(test_movie.title), [test_movie])
+            self.assertEqual(reader.find("missing"), [])
+            self.assertIsNone(reader.get("missing"))
+            self.assertRaises(KeyError, reader.__getitem__, "missing")
+
+    def test_read_many(self):
+        with PackReader(self.target) as reader:
+            for workers in (1, 2):
+                self.assertEqual(dict(reader.read_many(workers=workers, chunk_size=2)), self.models)
+            self.assertEqual(list(reader.read_many(["movie.xml"], workers=1)), [("movie.xml", test_movie)])
+
+    def test_writer_errors(self):
+        with PackWriter(path.join(self.folder.name, "other.pack")) as writer:
+            writer.add(test_movie)
+            self.assertRaises(ValueError, writer.add, test_movie)
+            self.assertRaises(ValueError, writer.add, Actor())
+        self.assertRaises(ValueError, writer.add, test_show, "closed")
+
+    def test_invalid(self):
+        with open(self.target, "rb") as file:
+            data = file.read()
+        for content in (data[:-1], b"x" * len(data), data[:4] + b"\x02" + data[5:]):
+            with open(self.target, "wb") as file:
+                file.write(content)
+            self.assertRaises(ValueError, PackReader, self.target)
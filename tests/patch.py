@@ -0,0 +1,174 @@
+import codecs
+from datetime import date
+from os import path, stat
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from xml.etree.ElementTree import ParseError
+
+from avalonplex_core.model import Actor
+from avalonplex_core.serialize import XmlSerializer, WriteResult
+from tests.serialize import test_movie
+
+__all__ = ["TestPatch"]
+
+_document = """<?xml version='1.0' encoding='utf-8'?>
+<!-- written by another tool -->
+<movie>
+    <title>a</title>
+    <!-- keep me -->
+    <rating>8</rating>
+    <custom attribute="1">x</custom>
+    <genre>b</genre>
+</movie>
+"""
+
+_preserved = """<?xml version="1.0" encoding="utf-8"?>
+<movie xmlns:kodi="urn:kodi">
+    <title>Tom &amp; &quot;Jerry&quot;</title>
+    <plot><![CDATA[a <b> c]]></plot>
+    <rating max='10'>8</rating>
+    <thumb aspect='poster'/>
+    <kodi:art kodi:type="fanart">x</kodi:art>
+</movie>
+"""
+
+
+class TestPatch(TestCase):
+    def setUp(self):
+        self.folder = TemporaryDirectory()
+        self.target = path.join(self.folder.name, "movie.xml")
+        with open(self.target, "w", encoding="utf-8") as file:
+            file.write(_document)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def patch_text(self, document: str, changes: dict) -> str:
+        with open(self.target, "w", encoding="utf-8") as file:
+            file.write(document)
+        XmlSerializer().patch(self.target, changes)
+        return self.read()
+
+    def read(self) -> str:
+        with open(self.target, "r", encoding="utf-8") as file:
+            return file.read()
+
+    def test_patch_in_place(self):
+        self.assertEqual(XmlSerializer().patch(self.target, {"rating": 9.5, "genres": ["b", "c"]}),
+                         WriteResult.WRITTEN)
+        self.assertEqual(self.read(), _document.replace("<rating>8</rating>", "<rating>9.5</rating>")
+                         .replace("<genre>b</genre>", "<genre>b</genre>\n    <genre>c</genre>"))
+
+    def test_patch_insert_and_remove(self):
+        x = XmlSerializer()
+        x.patch(self.target, {"release_date": date(2010, 1, 2), "title": None, "genres": []})
+        self.assertEqual(self.read(), "<?xml version='1.0' encoding='utf-8'?>\n<!-- written by another tool -->\n"
+                                      "<movie>\n    <!-- keep me -->\n    <rating>8</rating>\n"
+                                      "    <releasedate>2010-01-02</releasedate>\n"
+                                      "    <custom attribute=\"1\">x</custom>\n</movie>\n")
+        x.patch(self.target, {"actors": [Actor("n", "r")]})
+        self.assertIn("    <releasedate>2010-01-02</releasedate>\n    <actor>\n        <name>n</name>\n"
+                      "        <role>r</role>\n    </actor>\n    <custom attribute=\"1\">x</custom>\n</movie>\n",
+                      self.read())
+        self.assertEqual(x.deserialize(self.target).actors, [Actor("n", "r")])
+
+    def test_patch_unchanged(self):
+        mtime = stat(self.target).st_mtime_ns
+        result = XmlSerializer().patch(self.target, {"rating": 8.0, "title": " a ", "genres": ["b"], "plot": None})
+        self.assertEqual(result, WriteResult.SKIPPED)
+        self.assertEqual(stat(self.target).st_mtime_ns, mtime)
+        self.assertEqual(self.read(), _document)
+
+    def test_patch_keep_empty(self):
+        x = XmlSerializer(ignore_none=False, ignore_empty=False)
+        other = path.join(self.folder.name, "other.xml")
+        copyfile("example/movie (2010).xml", other)
+        self.assertEqual(x.patch(other, {"rating": 9.0}), WriteResult.WRITTEN)
+        movie = x.deserialize(other)
+        self.assertEqual(movie.rating, 9.0)
+        movie.rating = test_movie.rating
+        self.assertEqual(movie, test_movie)
+        self.assertEqual(x.patch(self.target, {"plot": None, "genres": ["b", "c"]}), WriteResult.WRITTEN)
+        self.assertEqual(self.read(), _document.replace("<genre>b</genre>", "<genre>b</genre>\n    <genre>c</genre>")
+                         .replace("<title>a</title>", "<title>a</title>\n    <plot />"))
+
+    def test_patch_encodings(self):
+        x = XmlSerializer()
+        text = _document.replace("<title>a</title>", "<title>é 赤</title>")
+        for encoding, bom in (("utf-16", b""), ("utf-16-le", codecs.BOM_UTF16_LE), ("utf-16-be", codecs.BOM_UTF16_BE),
+                              ("utf-8", codecs.BOM_UTF8), ("utf-8", b"")):
+            document = text.replace("encoding='utf-8'", f"encoding='{encoding.split('-le')[0].split('-be')[0]}'")
+            with open(self.target, "wb") as file:
+                file.write(bom + document.encode(encoding))
+            self.assertEqual(x.patch(self.target, {"rating": 9.0}), WriteResult.WRITTEN)
+            with open(self.target, "rb") as file:
+                self.assertEqual(file.read(), bom + document.replace("<rating>8</rating>", "<rating>9.0</rating>")
+                                 .encode(encoding))
+            self.assertEqual(x.deserialize(self.target).title, "é 赤")
+        document = text.replace("encoding='utf-8'", "encoding='iso-8859-1'").replace("赤", "&#36196;")
+        with open(self.target, "wb") as file:
+            file.write(document.encode("iso-8859-1"))
+        x.patch(self.target, {"rating": 9.0})
+        with open(self.target, "rb") as file:
+            self.assertEqual(file.read(), document.replace("<rating>8</rating>", "<rating>9.0</rating>")
+                             .encode("iso-8859-1"))
+
+    def test_patch_epilog(self):
+        with open(self.target, "w", encoding="utf-8") as file:
+            file.write(_document + "<!-- </movie> -->\n<?pi </movie>?>\n")
+        self.assertEqual(XmlSerializer().patch(self.target, {"rating": 9.0}), WriteResult.WRITTEN)
+        self.assertEqual(self.read(), _document.replace("<rating>8</rating>", "<rating>9.0</rating>") +
+                         "<!-- </movie> -->\n<?pi </movie>?>\n")
+        with open(self.target, "w", encoding="utf-8") as file:
+            file.write("<movie/>")
+        XmlSerializer().patch(self.target, {"rating": 9.0})
+        self.assertEqual(self.read(), "<movie><rating>9.0</rating></movie>")
+
+    def test_patch_preserves_markup(self):
+        document = _preserved.replace("<rating max='10'>8</rating>", "<rating max='10'>9.0</rating>")
+        self.assertEqual(self.patch_text(_preserved, {"rating": 9.0}), document)
+        self.assertEqual(self.patch_text(_preserved, {"plot": "p", "studio": "s"}),
+                         _preserved.replace("<![CDATA[a <b> c]]>", "p")
+                         .replace("<rating max='10'>8</rating>", "<rating max='10'>8</rating>\n    <studio>s</studio>"))
+        self.assertEqual(self.patch_text(_preserved, {"title": None, "original_title": "o", "sort_title": "s"}),
+                         _preserved.replace("<title>Tom &amp; &quot;Jerry&quot;</title>",
+                                            "<originaltitle>o</originaltitle>\n    <sorttitle>s</sorttitle>"))
+        self.assertEqual(XmlSerializer().deserialize(self.target).plot, "a <b> c")
+
+    def test_patch_empty_root(self):
+        self.assertEqual(self.patch_text("<movie/>", {"rating": 9.0}), "<movie><rating>9.0</rating></movie>")
+        self.assertEqual(self.patch_text("<movie a='1' />", {"rating": 9.0}),
+                         "<movie a='1'><rating>9.0</rating></movie>")
+        self.assertEqual(self.patch_text("<movie></movie>", {"genres": ["a", "b"]}),
+                         "<movie><genre>a</genre><genre>b</genre></movie>")
+        self.assertEqual(self.patch_text("<movie>\n    <!-- c -->\n</movie>\n", {"rating": 9.0}),
+                         "<movie>\n    <!-- c -->\n    <rating>9.0</rating>\n</movie>\n")
+        self.assertEqual(self.patch_text("<movie><title>a</title><mpaa/></movie>", {"mpaa": "m", "title": "b"}),
+                         "<movie><title>b</title><mpaa>m</mpaa></movie>")
+
+    def test_patch_invalid(self):
+        for document, error in (("<?xml version='1.0' encoding='unknown'?><movie />", ValueError),
+                                ("<movie><rating>8</rating>", ParseError), ("<tvshows/>", NotImplementedError)):
+            with open(self.target, "w", encoding="utf-8") as file:
+                file.write(document)
+            self.assertRaises(error, XmlSerializer().patch, self.target, {"rating": 9.0})
+            self.assertEqual(self.read(), document)
+
+    def test_patch_unknown(self):
+        self.assertRaises(KeyError, XmlSerializer().patch, self.target, {"releasedate": date(2010, 1, 2)})
+        self.assertRaises(KeyError, XmlSerializer().patch, self.target, {"aired": date(2010, 1, 2)})
+
+    def test_patch_many(self):
+        other = path.join(self.folder.name, "other.xml")
+        copyfile("example/movie (2010).xml", other)
+        for workers in (1, 2):
+            report = XmlSerializer().patch_many([(self.target, {"studio": "s"}), (other, {"rating": 1.0}),
+                                                 (path.join(self.folder.name, "missing.xml"), {})], workers)
+            self.assertEqual(report[:2], [(self.target, WriteResult.WRITTEN if workers == 1 else WriteResult.SKIPPED),
+                                          (other, WriteResult.WRITTEN if workers == 1 else WriteResult.SKIPPED)])
+            self.assertIsInstance(report[2][1], FileNotFoundError)
+        movie = XmlSerializer().deserialize(other)
+        self.assertEqual(movie.rating, 1.0)
+        movie.rating = test_movie.rating
+        self.assertEqual(movie, test_movie)
@@ -0,0 +1,46 @@
+from datetime import date
+from unittest import TestCase
+from xml.etree.ElementTree import fromstring
+
+from avalonplex_core.model import Model, Episode, Movie, Actor
+from avalonplex_core.schema import Field, parse_date, format_date
+
+__all__ = ["TestSchema"]
+
+
+class Album(Model):
+    _root = "album"
+    _fields = (Field("title"), Field("year", codec=int), Field("artists", "actor", codec=Actor, multiple=True))
+
+    def __init__(self, title=None, year=None, artists=None):
+        self.title = title
+        self.year = year
+        self.artists = artists if artists is not None else []
+
+
+class TestSchema(TestCase):
+    def test_mapping(self):
+        self.assertEqual(Episode._mapping(), {"directors": "director", "writers": "writer"})
+        self.assertEqual(Movie._get_attribute_order_list(),
+                         ["title", "originaltitle", "sorttitle", "set", "mpaa", "plot", "tagline", "rating",
+                          "releasedate", "studio", "director", "writer", "genre", "actor"])
+        self.assertIsNone(Model._get_attribute_order_list())
+
+    def test_dates(self):
+        self.assertEqual(parse_date("2009-10-07"), date(2009, 10, 7))
+        self.assertEqual(parse_date("2009-1-7"), date(2009, 1, 7))
+        self.assertRaises(ValueError, parse_date, "2009-13-07")
+        self.assertRaises(TypeError, parse_date, None)
+        self.assertEqual(format_date(date(2010, 1, 23)), "2010-01-23")
+
+    def test_from_xml_first_wins(self):
+        root = fromstring("<episodedetails><rating/><rating>5</rating><title>a</title><title>b</title>"
+                          "<director>x</director><unknown /><director>y</director></episodedetails>")
+        self.assertEqual(Episode.from_xml(root), Episode("a", directors=["x", "y"]))
+
+    def test_declarative_model(self):
+        album = Album("11eyes OST", 2009, [Actor("Asriel")])
+        xml = album.as_xml()
+        self.assertEqual(xml, "<album>\n    <title>11eyes OST</title>\n    <year>2009</year>\n    <actor>\n"
+                              "        <name>Asriel</name>\n    </actor>\n</album>\n")
+        self.assertEqual(Album.from_xml(fromstring(xml)), album)
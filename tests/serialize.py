@@ -1,11 +1,16 @@
 from datetime import date
-from os import remove
+from io import BytesIO
+from pathlib import Path
+from os import remove, path, listdir, stat, chmod
+from shutil import copyfile
+from tempfile import TemporaryDirectory
 from unittest import TestCase
+from xml.etree import ElementTree
 
 from avalonplex_core.model import Episode, Show, Actor, Movie
-from avalonplex_core.serialize import XmlSerializer
+from avalonplex_core.serialize import XmlSerializer, WriteResult
 
-__all__ = ["TestSerialize", "TestDeserialize"]
+__all__ = ["TestSerialize", "TestDeserialize", "TestIterDeserialize", "TestScan", "TestWrite"]
 
 
 class TestSerialize(TestCase):
@@ -42,6 +47,18 @@ class TestSerialize(TestCase):
                 self.assertEqual(test_output, data)
             remove("1.xml")
 
+    def test_serialize_encoding(self):
+        x = XmlSerializer(encoding="iso-8859-1")
+        x.serialize(test_movie, "1.xml")
+        with open("1.xml", "r", encoding="iso-8859-1") as output:
+            self.assertEqual(output.readline(), "<?xml version='1.0' encoding='iso-8859-1'?>\n")
+        self.assertEqual(x.deserialize("1.xml"), test_movie)
+        remove("1.xml")
+
+    def test_serialize_does_not_patch_element_tree(self):
+        # noinspection PyProtectedMember
+        self.assertEqual(ElementTree._serialize_xml.__module__, "xml.etree.ElementTree")
+
 
 class TestDeserialize(TestCase):
     def test_deserialize_episode(self):
@@ -57,6 +74,103 @@ class TestDeserialize(TestCase):
         self.assertEqual(x.deserialize("example/movie (2010).xml"), test_movie)
 
 
+class TestIterDeserialize(TestCase):
+    def test_iterdeserialize_single(self):
+        x = XmlSerializer()
+        self.assertEqual(list(x.iterdeserialize("example/tvshow.xml")), [test_show])
+
+    def test_iterdeserialize_wrapped(self):
+        x = XmlSerializer()
+        parts = [b"<library>\n", b"<meta><source>scraper</source></meta>\n"]
+        for name in ["episode.xml", "tvshow.xml", "movie (2010).xml"]:
+            with open(path.join("example", name), "rb") as example:
+                parts.append(example.read())
+        parts.append(b"</library>\n")
+        models = list(x.iterdeserialize(BytesIO(b"".join(parts))))
+        self.assertEqual(models, [test_episode, test_show, test_movie])
+
+
+class TestScan(TestCase):
+    def test_scan_serial(self):
+        x = XmlSerializer()
+        results = dict(x.scan("example", workers=1))
+        self.assertEqual(results[path.join("example", "episode.xml")], test_episode)
+        self.assertEqual(results[path.join("example", "tvshow.xml")], test_show)
+        self.assertEqual(results[path.join("example", "movie (2010).xml")], test_movie)
+
+    def test_scan_parallel(self):
+        x = XmlSerializer()
+        serial = list(x.scan("example", workers=1))
+        self.assertEqual(list(x.scan("example", workers=2, chunk_size=1)), serial)
+        self.assertCountEqual(list(x.scan("example", workers=2, chunk_size=1, ordered=False)), serial)
+
+    def test_scan_errors(self):
+        x = XmlSerializer()
+        with TemporaryDirectory() as folder:
+            with open(path.join(folder, "broken.xml"), "w", encoding="utf-8") as broken:
+                broken.write("<movie><title>")
+            with open(path.join(folder, "unknown.xml"), "w", encoding="utf-8") as unknown:
+                unknown.write("<album />")
+            copyfile("example/episode.xml", path.join(folder, "episode.xml"))
+            results = dict(x.scan(folder, workers=2))
+        self.assertEqual(len(results), 3)
+        self.assertIsInstance(results[path.join(folder, "unknown.xml")], NotImplementedError)
+        self.assertIsInstance(results[path.join(folder, "broken.xml")], Exception)
+
+
+class TestWrite(TestCase):
+    def test_skip_unchanged(self):
+        x = XmlSerializer(skip_unchanged=True)
+        with TemporaryDirectory() as folder:
+            target = path.join(folder, "episode.xml")
+            self.assertEqual(x.serialize(test_episode, target), WriteResult.CREATED)
+            mtime = stat(target).st_mtime_ns
+            self.assertEqual(x.serialize(test_episode, target), WriteResult.SKIPPED)
+            self.assertEqual(XmlSerializer(skip_unchanged=True).serialize(test_episode, target), WriteResult.SKIPPED)
+            self.assertEqual(stat(target).st_mtime_ns, mtime)
+            self.assertEqual(x.serialize(Episode("changed"), target), WriteResult.WRITTEN)
+            self.assertEqual(XmlSerializer().serialize(Episode("changed"), target), WriteResult.WRITTEN)
+
+    def test_atomic(self):
+        x = XmlSerializer(atomic=True)
+        with TemporaryDirectory() as folder:
+            target = path.join(folder, "tvshow.xml")
+            self.assertEqual(x.serialize(test_show, target), WriteResult.CREATED)
+            chmod(target, 0o640)
+            self.assertEqual(x.serialize(test_show, "tvshow.xml", Path(folder)), WriteResult.WRITTEN)
+            self.assertEqual(stat(target).st_mode & 0o777, 0o640)
+            self.assertEqual(listdir(folder), ["tvshow.xml"])
+            with open(target, "r", encoding="utf-8") as output, \
+                    open("example/tvshow.xml", "r", encoding="utf-8") as example:
+                self.assertEqual(output.read(), example.read())
+
+    def test_serialize_many(self):
+        x = XmlSerializer(skip_unchanged=True)
+        episodes = [(Episode(f"e{index}", index), path.join("season 1", f"e{index}.xml")) for index in range(5)]
+        with TemporaryDirectory() as folder:
+            for workers in (1, 2):
+                report = x.serialize_show(test_show, episodes, Path(folder), workers=workers, chunk_size=2, sync=True)
+                self.assertEqual([name for name, _ in report],
+                                 [path.join(folder, name) for name in ["tvshow.xml", *[name for _, name in episodes]]])
+                self.assertEqual({result for _, result in report},
+                                 {WriteResult.CREATED} if workers == 1 else {WriteResult.SKIPPED})
+            for (episode, name), (target, _) in zip(episodes, report[1:]):
+                self.assertEqual(x.deserialize(target), episode)
+            self.assertEqual(x.deserialize(path.join(folder, "tvshow.xml")), test_show)
+
+    def test_serialize_many_errors(self):
+        x = XmlSerializer(atomic=True)
+        with TemporaryDirectory() as folder:
+            with open(path.join(folder, "file"), "w"):
+                pass
+            report = x.serialize_many([(test_movie, "movie.xml"), (object(), "broken.xml"),
+                                       (test_episode, path.join("file", "episode.xml"))], Path(folder), sync=True)
+            self.assertEqual(report[0], (path.join(folder, "movie.xml"), WriteResult.CREATED))
+            self.assertIsInstance(report[1][1], AttributeError)
+            self.assertIsInstance(report[2][1], OSError)
+            self.assertEqual(sorted(listdir(folder)), ["file", "movie.xml"])
+
+
 test_episode = Episode("赤い夜 ~ piros éjszaka", 1, date(2009, 10, 7), "TV-14",
                        "皐月駆は幼馴染の水奈瀬ゆかと平凡な生活を送っていた。辛い過去を背負う駆だが、クラスメイトの匡や香央里といった明るい二人と、やさしく接してくれるゆかとの学生生活を過ごしていた。\n\n"
                        "だが、ある日生まれつき見えない右目に激痛がはしったとたん、赤く染まる不気味な世界に迷い込むことに…。",
@@ -0,0 +1,68 @@
+from io import BytesIO
+from os import path
+from pickle import dumps, loads
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from avalonplex_core.serialize import XmlSerializer
+from avalonplex_core.stats import Stats
+from tests.serialize import test_episode, test_show
+
+__all__ = ["TestStats"]
+
+
+class TestStats(TestCase):
+    def test_serialize_and_deserialize(self):
+        stats = Stats()
+        x = XmlSerializer(stats=stats, skip_unchanged=True)
+        with TemporaryDirectory() as folder:
+            target = path.join(folder, "tvshow.xml")
+            x.serialize(test_show, target)
+            x.serialize(test_show, target)
+            self.assertEqual(x.deserialize(target), test_show)
+            size = len(x.encode(test_show))
+        data = stats.as_dict()
+        self.assertEqual(data["phases"]["render"]["calls"], 2)
+        self.assertEqual(data["phases"]["convert"]["calls"], 1)
+        self.assertEqual(data["counters"]["files_created"], 1)
+        self.assertEqual(data["counters"]["files_skipped"], 1)
+        self.assertEqual(data["counters"]["bytes_written"], size)
+        self.assertEqual(data["counters"]["bytes_read"], size)
+        self.assertEqual(data["counters"]["elements_parsed"], 24)
+        self.assertEqual(data["models"], {"serialize": {"tvshow": 2}, "deserialize": {"tvshow": 1}})
+
+    def test_scan_merges_worker_stats(self):
+        for workers in [1, 2]:
+            stats = Stats()
+            x = XmlSerializer(stats=stats)
+            self.assertEqual(len(list(x.scan("example", workers=workers, chunk_size=1))), 3)
+            self.assertEqual(stats.calls["parse"], 3)
+            self.assertEqual(stats.counters["files_failed"], 0)
+            self.assertEqual(sum(stats.models.values()), 3)
+
+    def test_iterdeserialize(self):
+        stats = Stats()
+        with open("example/episode.xml", "rb") as example:
+            data = example.read()
+        models = list(XmlSerializer(stats=stats).iterdeserialize(BytesIO(b"<items>" + data * 2 + b"</items>")))
+        self.assertEqual(models, [test_episode, test_episode])
+        self.assertEqual(stats.models[("deserialize", "episodedetails")], 2)
+
+    def test_export(self):
+        stats = Stats()
+        stats.observe("parse", 0.5)
+        stats.count("bytes_read", 10)
+        stats.count_model("deserialize", "movie")
+        other = loads(dumps(stats))
+        stats.merge(other)
+        self.assertEqual(stats.to_prometheus("nfo"),
+                         '# TYPE nfo_phase_seconds_total counter\n'
+                         'nfo_phase_seconds_total{phase="parse"} 1.0\n'
+                         '# TYPE nfo_phase_calls_total counter\n'
+                         'nfo_phase_calls_total{phase="parse"} 2\n'
+                         '# TYPE nfo_bytes_read_total counter\n'
+                         'nfo_bytes_read_total 20\n'
+                         '# TYPE nfo_models_total counter\n'
+                         'nfo_models_total{operation="deserialize",type="movie"} 2\n')
+        stats.reset()
+        self.assertEqual(stats.to_prometheus(), "")
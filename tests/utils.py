@@ -0,0 +1,60 @@
+from os import makedirs, path, symlink
+from tempfile import TemporaryDirectory
+from typing import Iterator, List
+from unittest import TestCase
+
+from avalonplex_core.utils import chunked, iter_file_stats, iter_files, parallel_map
+
+__all__ = ["TestParallelMap", "TestIterFiles"]
+
+
+def _square_chunk(items: List[int]) -> List[int]:
+    return [item * item for item in items]
+
+
+class TestParallelMap(TestCase):
+    def setUp(self):
+        self.consumed = 0
+
+    def source(self, count: int) -> Iterator[int]:
+        for i in range(count):
+            self.consumed += 1
+            yield i
+
+    def test_chunked(self):
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+    def test_ordered(self):
+        for workers in (1, 2):
+            self.assertEqual(list(parallel_map(_square_chunk, range(100), workers, 3)), [i * i for i in range(100)])
+
+    def test_unordered(self):
+        results = list(parallel_map(_square_chunk, range(100), 2, 3, ordered=False))
+        self.assertEqual(sorted(results), [i * i for i in range(100)])
+
+    def test_bounded_window(self):
+        for ordered in (True, False):
+            self.consumed = 0
+            results = parallel_map(_square_chunk, self.source(1000), 2, 10, ordered)
+            next(results)
+            self.assertLessEqual(self.consumed, 2 * 2 * 2 * 10)
+            self.assertEqual(len(list(results)) + 1, 1000)
+
+
+class TestIterFiles(TestCase):
+    def test_stats_match_walk(self):
+        with TemporaryDirectory() as root:
+            for folder in ("a", path.join("a", "b"), "c"):
+                makedirs(path.join(root, folder))
+                for name in ("x.xml", "y.txt", "z.xml"):
+                    with open(path.join(root, folder, name), "w") as file:
+                        file.write(name)
+            symlink(path.join(root, "a", "x.xml"), path.join(root, "link.xml"))
+            symlink(path.join(root, "a"), path.join(root, "linked"))
+            symlink(path.join(root, "missing.xml"), path.join(root, "broken.xml"))
+            stats = list(iter_file_stats(root))
+            self.assertEqual([file for file, _ in stats], list(iter_files(root)))
+            stats = dict(stats)
+            self.assertIsNone(stats[path.join(root, "broken.xml")])
+            self.assertEqual(stats[path.join(root, "link.xml")].st_size, 5)
+            self.assertNotIn(path.join(root, "linked", "x.xml"), stats)
@@ -0,0 +1,71 @@
+from os import path
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from avalonplex_core.model import Movie
+from avalonplex_core.validate import Validator, Diagnostic, Severity
+
+__all__ = ["TestValidate"]
+
+_document = b"""<movie>
+    <title>a</title>
+    <rating>high</rating>
+    <title>b</title>
+    <custom>x</custom>
+    <releasedate>2010-13-01</releasedate>
+    <genre>a</genre>
+    <genre>b</genre>
+    <actor>
+        <name> </name>
+        <role>r</role>
+        <order>1</order>
+    </actor>
+</movie>
+"""
+
+
+class TestValidate(TestCase):
+    def test_valid(self):
+        validator = Validator()
+        for example in ["episode.xml", "tvshow.xml", "movie (2010).xml"]:
+            self.assertEqual(validator.validate(path.join("example", example)), [])
+            with open(path.join("example", example), "rb") as file:
+                self.assertEqual(validator.check(file.read()), [])
+        self.assertEqual(validator.validate_bytes(memoryview(b"<movie><title>a</title><rating /></movie>")), [])
+
+    def test_diagnostics(self):
+        diagnostics = Validator().validate_bytes(_document, "movie.xml")
+        self.assertEqual([(d.line, d.severity, d.code) for d in diagnostics], [
+            (3, Severity.ERROR, "invalid-value"),
+            (4, Severity.WARNING, "duplicate-tag"),
+            (5, Severity.WARNING, "unknown-tag"),
+            (6, Severity.ERROR, "invalid-value"),
+            (12, Severity.WARNING, "unknown-tag"),
+            (9, Severity.ERROR, "missing-required")
+        ])
+        self.assertEqual(diagnostics[0], Diagnostic("movie.xml", 3, 4, Severity.ERROR, "invalid-value",
+                                                    "Invalid float value in <rating>: 'high'"))
+
+    def test_required(self):
+        self.assertEqual([d.code for d in Validator().validate_bytes(b"<movie><plot>p</plot></movie>")],
+                         ["missing-required"])
+        self.assertEqual(Validator({Movie: ["plot"]}).validate_bytes(b"<movie><plot>p</plot></movie>"), [])
+
+    def test_errors(self):
+        validator = Validator()
+        self.assertEqual([(d.line, d.code) for d in validator.validate_bytes(b"<movie>\n<title>a</movie>")],
+                         [(2, "syntax")])
+        self.assertEqual([d.code for d in validator.validate_bytes(b"<unknown><title /></unknown>")],
+                         ["unknown-root"])
+        self.assertEqual([d.code for d in validator.validate("missing.xml")], ["io"])
+
+    def test_scan(self):
+        with TemporaryDirectory() as folder:
+            copyfile("example/tvshow.xml", path.join(folder, "tvshow.xml"))
+            with open(path.join(folder, "movie.xml"), "wb") as file:
+                file.write(_document)
+            for workers in (1, 2):
+                results = dict(Validator().scan(folder, workers=workers, chunk_size=1))
+                self.assertEqual(results[path.join(folder, "tvshow.xml")], [])
+                self.assertEqual(len(results[path.join(folder, "movie.xml")]), 6)
@@ -0,0 +1,91 @@
+from os import fsdecode, makedirs, path, remove, rename
+from shutil import copyfile, rmtree
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from avalonplex_core.model import Movie
+from avalonplex_core.serialize import XmlSerializer
+from avalonplex_core.watch import LibraryWatcher, Change
+from tests.serialize import test_show, test_movie
+
+__all__ = ["TestWatchPolling", "TestWatchInotify"]
+
+
+class TestWatchPolling(TestCase):
+    inotify = False
+
+    def setUp(self):
+        self.folder = TemporaryDirectory()
+        self.root = self.folder.name
+        self.show = path.join(self.root, "show", "tvshow.xml")
+        self.movie = path.join(self.root, "movie.xml")
+        makedirs(path.dirname(self.show))
+        copyfile("example/tvshow.xml", self.show)
+        copyfile("example/movie (2010).xml", self.movie)
+        try:
+            self.watcher = LibraryWatcher(self.root, interval=0.01, debounce=0.05, inotify=self.inotify)
+        except OSError:
+            self.skipTest("inotify is not available")
+
+    def tearDown(self):
+        self.watcher.close()
+        self.folder.cleanup()
+
+    def poll(self):
+        return {(event.change, event.path): event for event in self.watcher.poll(1.0)}
+
+    def test_load(self):
+        events = self.watcher.load(workers=1)
+        self.assertEqual({(event.change, event.path) for event in events},
+                         {(Change.ADDED, self.show), (Change.ADDED, self.movie)})
+        self.assertEqual(self.watcher.models, {self.show: test_show, self.movie: test_movie})
+        self.assertEqual(self.watcher.poll(0.05), [])
+
+    def test_changes(self):
+        self.watcher.load(workers=1)
+        XmlSerializer().serialize(Movie("changed"), self.movie)
+        added = path.join(self.root, "new", "movie.xml")
+        makedirs(path.dirname(added))
+        copyfile("example/movie (2010).xml", added)
+        remove(self.show)
+        events = self.poll()
+        self.assertEqual(set(events), {(Change.MODIFIED, self.movie), (Change.ADDED, added),
+                                       (Change.REMOVED, self.show)})
+        self.assertEqual(events[(Change.MODIFIED, self.movie)].old, test_movie)
+        self.assertEqual(events[(Change.MODIFIED, self.movie)].new, Movie("changed"))
+        self.assertEqual(events[(Change.REMOVED, self.show)].old, test_show)
+        self.assertEqual(self.watcher.models, {self.movie: Movie("changed"), added: test_movie})
+
+    def test_moves_and_errors(self):
+        self.watcher.load(workers=1)
+        moved = path.join(self.root, "moved")
+        rename(path.dirname(self.show), moved)
+        with open(self.movie, "w") as file:
+            file.write("<movie>")
+        events = self.poll()
+        self.assertEqual(set(events), {(Change.REMOVED, self.show), (Change.ADDED, path.join(moved, "tvshow.xml")),
+                                       (Change.MODIFIED, self.movie)})
+        self.assertIsInstance(events[(Change.MODIFIED, self.movie)].new, Exception)
+        self.assertIn(self.movie, self.watcher.errors)
+        self.assertNotIn(self.movie, self.watcher.models)
+        rmtree(moved)
+        self.assertEqual(set(self.poll()), {(Change.REMOVED, path.join(moved, "tvshow.xml"))})
+
+    def test_undecodable_names(self):
+        folder = path.join(self.root, fsdecode(b"bad\xff"))
+        makedirs(folder)
+        inside = path.join(folder, "movie.xml")
+        copyfile("example/movie (2010).xml", inside)
+        self.assertIn((Change.ADDED, inside), {(event.change, event.path) for event in self.watcher.load(workers=1)})
+        added = path.join(self.root, fsdecode(b"x\xff.xml"))
+        copyfile("example/movie (2010).xml", added)
+        events = self.poll()
+        self.assertEqual(set(events), {(Change.ADDED, added)})
+        self.assertEqual(self.watcher.models[added], test_movie)
+
+
+class TestWatchInotify(TestWatchPolling):
+    inotify = True
+
+    def test_uses_inotify(self):
+        self.assertTrue(self.watcher.uses_inotify)